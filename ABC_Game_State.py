@@ -5,6 +5,9 @@ class GameState(ABC):
     Abstract base class for game states.
     Defines the interface all concrete states must implement.
     """
+    ASSETS = ()  # Image keys drawn by the state (or AssetLoader.ALL); it is drawn once they are loaded
+    IN_LEVEL = False  # The state belongs to level game.current_lvl; profiles are tagged with it
+
     @abstractmethod
     def handle_input(self, event):
         """
@@ -32,5 +35,8 @@ class GameState(ABC):
 
         Args:
             screen (pygame.Surface): The game screen surface.
+
+        Returns:
+            list[pygame.Rect] | None: The areas that changed, or None to present the whole screen.
         """
         pass
\ No newline at end of file
@@ -0,0 +1,156 @@
+import pygame
+
+LOOP = 'loop'          # 0, 1, 2, 0, 1, 2, ...
+PINGPONG = 'pingpong'  # 0, 1, 2, 1, 0, 1, ...
+ONCE = 'once'          # 0, 1, 2, then done
+
+MODES = (LOOP, PINGPONG, ONCE)
+
+
+class Clip:
+    """
+    An animation: frames shown one after another, each for interval ms.
+    Clips hold no playback state and can be shared by any number of animators.
+    """
+
+    __slots__ = ('frames', 'interval', 'mode')
+
+    def __init__(self, frames, interval, mode=LOOP):
+        if not frames:
+            raise ValueError("A clip needs at least one frame")
+        if interval <= 0:
+            raise ValueError(f"Clip interval must be positive, got {interval}")
+        if mode not in MODES:
+            raise ValueError(f"Unknown clip mode {mode!r}, expected one of {MODES}")
+        self.frames = list(frames)
+        self.interval = interval
+        self.mode = mode
+
+    def index(self, step):
+        """Frame index shown after step intervals."""
+        n = len(self.frames)
+        if self.mode == LOOP:
+            return step % n
+        if self.mode == ONCE:
+            return min(step, n - 1)
+        period = 2 * (n - 1) or 1
+        i = step % period
+        return i if i < n else period - i
+
+
+class Animator:
+    """
+    Plays one clip at a time for a sprite. The sprite chooses the clip with
+    play() or stop() and reads `frame`; the Timeline moves it forward.
+    """
+
+    def __init__(self, timeline, clip, owner=None):
+        """
+        Args:
+            timeline (Timeline): Timeline that advances this animator.
+            clip (Clip): Clip whose first frame is shown until something is played.
+            owner (pygame.sprite.Sprite): Sprite being animated. Once it is killed,
+                the timeline forgets the animator.
+        """
+        self.timeline = timeline
+        self.owner = owner
+        self.clip = clip
+        self.frame = clip.frames[0]
+        self.start = timeline.time
+        self.step = 0
+        self.playing = False
+        self.done = False  # A ONCE clip has played to the end
+
+    def play(self, clip, restart=False):
+        """Start playing clip from its first frame, unless it is playing already."""
+        if clip is self.clip and self.playing and not restart:
+            return
+        self.clip = clip
+        self.frame = clip.frames[0]
+        self.start = self.timeline.time
+        self.step = 0
+        self.playing = True
+        self.done = False
+        self.timeline.active[self] = None
+
+    def stop(self, clip=None, index=0):
+        """Hold a frame of clip (default: the current one) and sleep until the next play()."""
+        if clip is not None:
+            self.clip = clip
+        self.frame = self.clip.frames[index]
+        self.playing = False
+        self.timeline.active.pop(self, None)
+
+    def advance(self, time):
+        """Show the frame due at timeline time. Returns False once a ONCE clip has ended."""
+        step = int((time - self.start) // self.clip.interval)
+        if step != self.step:
+            self.step = step
+            clip = self.clip
+            if clip.mode == ONCE and step >= len(clip.frames):
+                self.playing = False
+                self.done = True
+                return False
+            self.frame = clip.frames[clip.index(step)]
+        return True
+
+
+class AnimatedSprite(pygame.sprite.Sprite):
+    """Sprite whose image is the current frame of its `animator`."""
+
+    @property
+    def image(self):
+        return self.animator.frame
+
+
+class Timeline:
+    """
+    Advances every playing animator of a level in one pass per tick.
+
+    Frames are worked out from the timeline time rather than counted per
+    update, so an animator that is skipped for a while shows the right frame
+    again as soon as it is advanced. Stopped animators are not visited at all.
+    """
+
+    def __init__(self, now=0, time_scale=1.0):
+        """
+        Args:
+            now (int): Current clock time in ms; later advance() calls are measured from it.
+            time_scale (float): Speed of all animations, 1.0 being normal.
+        """
+        self.now = now
+        self.time = 0.0  # Scaled ms the timeline has run, excluding pauses
+        self.time_scale = time_scale
+        self.paused = False
+        self.active = {}  # Playing animators, in the order they started (dict used as ordered set)
+        self.cull = None
+        self.advanced = 0  # Animators advanced by the last advance()
+        self.skipped = 0   # Animators skipped by the cull predicate in the last advance()
+
+    def set_cull(self, predicate):
+        """
+        Skip animators for which predicate(animator) is true, e.g. those of hidden
+        sprites. Animators playing a ONCE clip are never skipped, since sprites
+        wait for them to finish.
+        """
+        self.cull = predicate
+
+    def advance(self, now):
+        """Move the timeline to clock time now (ms) and update all playing animators."""
+        elapsed = now - self.now
+        self.now = now
+        self.advanced = self.skipped = 0
+        if self.paused:
+            return
+        self.time += elapsed * self.time_scale
+        time, cull, active = self.time, self.cull, self.active
+        for animator in list(active):
+            owner = animator.owner
+            if owner is not None and not owner.alive():
+                del active[animator]
+            elif cull is not None and animator.clip.mode != ONCE and cull(animator):
+                self.skipped += 1
+            else:
+                self.advanced += 1
+                if not animator.advance(time):
+                    del active[animator]
@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+import Images
+from Atlas import Atlas
+from Images import IMAGES
+
+ALL = '*'  # Asset list standing for every image in /Images
+
+
+class StartupTrace:
+    """
+    Timings of imports, asset loads and the first frame, in ms since process start.
+    Recording is thread-safe and does nothing unless enabled.
+    """
+
+    def __init__(self, enabled=False, origin=None):
+        self.enabled = enabled
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.events = []  # (start_ms, duration_ms, label, thread name)
+        self.lock = threading.Lock()
+
+    def span(self, label, start, end=None):
+        """Record something that ran from perf_counter() time start to end (default: now)."""
+        if not self.enabled:
+            return
+        end = time.perf_counter() if end is None else end
+        event = ((start - self.origin) * 1000, (end - start) * 1000, label, threading.current_thread().name)
+        with self.lock:
+            self.events.append(event)
+
+    def mark(self, label):
+        """Record a point in time, e.g. the first frame."""
+        now = time.perf_counter()
+        self.span(label, now, now)
+
+    def report(self):
+        lines = [f"{'at_ms':>9}  {'took_ms':>8}  {'thread':<16} event"]
+        for start, duration, label, thread in sorted(self.events):
+            lines.append(f"{start:>9.1f}  {duration:>8.1f}  {thread:<16} {label}")
+        return "\n".join(lines)
+
+
+class AssetHandle:
+    """
+    One image being loaded. Check `ready`, block with result(), or `await` it
+    from an asyncio task running on the main thread.
+    """
+
+    def __init__(self, loader, key):
+        self.loader = loader
+        self.key = key
+
+    @property
+    def ready(self):
+        return self.key in IMAGES
+
+    def result(self):
+        return self.loader.wait([self.key])[0]
+
+    def __await__(self):
+        future = self.loader.futures.get(self.key)
+        if future is not None and not self.ready:
+            yield from asyncio.wrap_future(future).__await__()
+        return self.result()
+
+
+class AssetLoader:
+    """
+    Loads the images of /Images without holding up the first frame.
+
+    start() takes every image from the decoded image cache when it is fresh.
+    Otherwise the PNGs are decoded in a thread pool, the assets of the first
+    state ahead of the rest, and poll() converts finished ones into IMAGES on the
+    main thread. Once all are in, their pixels are copied, they are packed into an
+    Atlas and the cache is rewritten from the copy in the background.
+    Game states list what they draw in ASSETS, and the game waits only for those.
+    """
+
+    def __init__(self, workers=4, trace=None):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='assets')
+        self.trace = trace if trace is not None else StartupTrace()
+        self.sources = Images.list_sources()
+        self.futures = {}  # key -> Future of the decoded, not yet converted Surface
+        self.cache_written = False
+        self.atlas = Atlas()
+
+    def start(self, first=()):
+        """Load every image, the keys in first before the others."""
+        start = time.perf_counter()
+        images = Images.load_cache(self.sources)
+        if images is not None:
+            IMAGES.update(images)
+            self.cache_written = True
+            self.trace.span(f"image cache ({len(images)} images)", start)
+            self.pack(Images.OPAQUE)
+            return
+        first = self.expand(first)
+        for key in first + [k for k in self.sources if k not in first]:
+            self.futures[key] = self.pool.submit(self.decode, key)
+
+    def decode(self, key):
+        start = time.perf_counter()
+        surf = pygame.image.load(self.sources[key])
+        self.trace.span(f"decode {key}", start)
+        return surf
+
+    def submit(self, label, fn, *args):
+        """Run other startup work (e.g. a slow import) in the pool, traced under label."""
+        def job():
+            start = time.perf_counter()
+            result = fn(*args)
+            self.trace.span(label, start)
+            return result
+        return self.pool.submit(job)
+
+    def expand(self, keys):
+        return list(self.sources) if keys == ALL else list(keys)
+
+    def request(self, keys):
+        """Handles for the given keys (or ALL)."""
+        return [AssetHandle(self, key) for key in self.expand(keys)]
+
+    def poll(self):
+        """Move decoded images into IMAGES. Call from the main thread, e.g. once per frame."""
+        for key, future in list(self.futures.items()):
+            if future.done():
+                self.finish(key, future.result())
+        if not self.futures and not self.cache_written:
+            self.cache_written = True
+            self.trace.mark("all images loaded")
+            # Pixels are copied here, before packing: surfaces must not be locked by another thread
+            # while they are blitted, and the opacity found for the cache also serves the atlas
+            start = time.perf_counter()
+            snapshot = Images.snapshot_pixels(IMAGES)
+            self.trace.span("copy pixels for the image cache", start)
+            self.pack({key for key, size, opaque, data in snapshot if opaque})
+            self.submit("write image cache", Images.write_cache_file, snapshot, self.sources)
+
+    def pack(self, opaque=None):
+        """Pack the loaded images into atlas sheets and give each its pixel format."""
+        start = time.perf_counter()
+        self.atlas.pack(IMAGES, opaque)
+        self.trace.span(self.atlas.report(), start)
+
+    def finish(self, key, surf):
+        IMAGES[key] = surf.convert_alpha()
+        del self.futures[key]
+
+    def ready(self, keys):
+        """True if every image in keys (or ALL) is in IMAGES."""
+        self.poll()
+        return not self.futures if keys == ALL else all(key in IMAGES for key in keys)
+
+    def wait(self, keys):
+        """
+        Block until the given images are loaded and return them. Images whose
+        decode has not started yet are decoded right away on this thread.
+        """
+        start = time.perf_counter()
+        keys = self.expand(keys)
+        for key in keys:
+            future = self.futures.get(key)
+            if future is not None:
+                surf = self.decode(key) if future.cancel() else future.result()
+                self.finish(key, surf)
+        self.poll()
+        self.trace.span(f"wait for {len(keys)} images", start)
+        return [IMAGES[key] for key in keys]
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True)  # Lets a pending cache write finish
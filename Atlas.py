@@ -0,0 +1,90 @@
+import pygame
+
+ATLAS_WIDTH = 512      # Width of a sheet; sheets are at most this tall as well
+ATLAS_MAX_FRAME = 64   # Images up to this size in both dimensions are packed into sheets
+
+
+def is_opaque(surf):
+    """True if every pixel of the image is fully opaque."""
+    w, h = surf.get_size()
+    return pygame.mask.from_surface(surf, 254).count() == w * h
+
+
+def surface_bytes(surf):
+    """Pixel memory owned by a surface (subsurfaces share their parent's)."""
+    if surf.get_parent() is not None:
+        return 0
+    return surf.get_pitch() * surf.get_height()
+
+
+class Atlas:
+    """
+    Packs small images with transparency (animation frames, boxes, fruits) into
+    a few sheets and converts every other image to the pixel format it needs:
+    convert() for fully opaque images (backgrounds, borders), which blit faster
+    without per-pixel alpha, and convert_alpha() for the rest.
+
+    Frames are placed on shelves, tallest first, and replaced in the image dict
+    by subsurfaces of their sheet, so callers keep using the same keys.
+    """
+
+    def __init__(self, width=ATLAS_WIDTH, max_frame=ATLAS_MAX_FRAME):
+        self.width = width
+        self.max_frame = max_frame
+        self.sheets = []
+        self.frames = {}  # key -> (sheet index, rect)
+        self.bytes_before = 0
+        self.bytes_after = 0
+
+    def pack(self, images, opaque=None):
+        """
+        Replace the surfaces in images (key -> Surface) in place.
+
+        Args:
+            opaque (set): Keys already known to be fully opaque; checked pixel by pixel if None.
+        """
+        self.bytes_before = sum(surface_bytes(s) for s in images.values())
+        frames = []
+        for key, surf in images.items():
+            w, h = surf.get_size()
+            if key in opaque if opaque is not None else is_opaque(surf):
+                images[key] = surf.convert()
+            elif w <= self.max_frame and h <= self.max_frame:
+                frames.append(key)
+            else:
+                images[key] = surf.convert_alpha()
+
+        frames.sort(key=lambda k: (-images[k].get_height(), k))
+        for sheet_index, placed in self.place(frames, images):
+            height = max(rect.bottom for rect in placed.values())
+            sheet = pygame.Surface((self.width, height), pygame.SRCALPHA).convert_alpha()
+            sheet.fill((0, 0, 0, 0))
+            for key, rect in placed.items():
+                # Adding onto transparent black copies the pixels exactly, alpha included
+                sheet.blit(images[key], rect, special_flags=pygame.BLEND_RGBA_ADD)
+                images[key] = sheet.subsurface(rect)
+                self.frames[key] = (sheet_index, rect)
+            self.sheets.append(sheet)
+        self.bytes_after = sum(surface_bytes(s) for s in images.values()) + \
+            sum(surface_bytes(s) for s in self.sheets)
+        return images
+
+    def place(self, keys, images):
+        """Yield (sheet index, {key: rect}) for each sheet, filling shelves left to right."""
+        placed, x, y, shelf = {}, 0, 0, 0
+        for key in keys:
+            w, h = images[key].get_size()
+            if x + w > self.width:
+                x, y, shelf = 0, y + shelf, 0
+            if y + h > self.width:
+                yield len(self.sheets), placed
+                placed, x, y, shelf = {}, 0, 0, 0
+            placed[key] = pygame.Rect(x, y, w, h)
+            x += w
+            shelf = max(shelf, h)
+        if placed:
+            yield len(self.sheets), placed
+
+    def report(self):
+        return (f"atlas: {len(self.frames)} frames in {len(self.sheets)} sheets, "
+                f"texture memory {self.bytes_before / 2**20:.2f} MB -> {self.bytes_after / 2**20:.2f} MB")
@@ -0,0 +1,92 @@
+import os, pygame
+
+SOUNDS = {}
+MUSIC_FILE = "las.mp3"     # Streamed through pygame.mixer.music, not preloaded
+NUM_CHANNELS = 8           # Fixed pool of mixer channels for sound effects
+MAX_VOICES_PER_SOUND = 3   # The same effect never plays on more channels than this
+
+_channels = []
+_voices = {}               # channel index -> (sound name, priority, start order)
+_play_count = 0
+
+
+def init_mixer():
+    """
+    Initialise the mixer and the channel pool once.
+    Returns False (and leaves audio disabled) when no audio device is available.
+    """
+    if _channels:
+        return True
+    try:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+    except pygame.error:
+        return False
+    pygame.mixer.set_num_channels(NUM_CHANNELS)
+    _channels.extend(pygame.mixer.Channel(i) for i in range(NUM_CHANNELS))
+    return True
+
+
+def load_sounds():
+    """
+    Decode every effect from /Sounds into memory, keyed by upper-case file name
+    without extension (e.g. 'BREAK', 'CREATE').
+    """
+    if not init_mixer():
+        return
+    sound_dir = os.path.join(os.getcwd(), 'Sounds')
+    for file in os.listdir(sound_dir):
+        name, ext = os.path.splitext(file)
+        if ext.lower() in ('.wav', '.mp3', '.ogg') and file != MUSIC_FILE:
+            SOUNDS[name.upper()] = pygame.mixer.Sound(os.path.join(sound_dir, file))
+
+
+def play(name, priority=0):
+    """
+    Play a preloaded effect on a channel from the pool.
+
+    Once the effect already plays MAX_VOICES_PER_SOUND times, its oldest voice
+    is restarted. When every channel is busy, the oldest voice with the lowest
+    priority not above this one is taken over; otherwise the effect is dropped.
+
+    Returns:
+        pygame.mixer.Channel | None: The channel used, or None if nothing was played.
+    """
+    global _play_count
+    sound = SOUNDS.get(name)
+    if sound is None:
+        return None
+
+    busy = {i: v for i, v in _voices.items() if _channels[i].get_busy()}
+    same = [i for i, v in busy.items() if v[0] == name]
+    if len(same) >= MAX_VOICES_PER_SOUND:
+        index = min(same, key=lambda i: busy[i][2])
+    else:
+        free = [i for i in range(len(_channels)) if i not in busy]
+        if free:
+            index = free[0]
+        else:
+            candidates = [i for i, v in busy.items() if v[1] <= priority]
+            if not candidates:
+                return None
+            index = min(candidates, key=lambda i: (busy[i][1], busy[i][2]))
+
+    _play_count += 1
+    _voices[index] = (name, priority, _play_count)
+    channel = _channels[index]
+    channel.play(sound)
+    return channel
+
+
+def start_music(path):
+    """Start looping background music, unless it is already playing."""
+    if not init_mixer() or pygame.mixer.music.get_busy():
+        return
+    pygame.mixer.music.load(path)
+    pygame.mixer.music.set_volume(1.0)
+    pygame.mixer.music.play(-1)
+
+
+def stop_music():
+    if pygame.mixer.get_init():
+        pygame.mixer.music.stop()
@@ -0,0 +1,59 @@
+"""
+Startup timing report: decode every PNG in /Images versus creating the same
+surfaces from the memory-mapped decoded image cache.
+
+Run from the repository root:
+    python -m Benchmarks.ImageCacheBenchmark
+    python -m Benchmarks.ImageCacheBenchmark --repeats 10 --headless
+"""
+import argparse
+import os
+import tempfile
+import time
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--headless", action="store_true", help="use SDL's dummy video driver")
+    args = parser.parse_args()
+
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    import pygame
+    import Images
+    from Settings import WIDTH, HEIGHT
+
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    sources = Images.list_sources()
+
+    rows = {"png decode": [], "cache build": [], "cache load": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, "image_cache.bin")
+        for _ in range(args.repeats):
+            images, ms = timed(Images.decode_pngs, sources)
+            rows["png decode"].append(ms)
+            _, ms = timed(Images.write_cache, images, sources, cache_file)
+            rows["cache build"].append(ms)
+            cached, ms = timed(Images.load_cache, sources, cache_file)
+            rows["cache load"].append(ms)
+            assert cached is not None and cached.keys() == images.keys()
+
+        size_mb = os.path.getsize(cache_file) / 2**20
+    print(f"{len(sources)} images, cache file {size_mb:.1f} MB, {args.repeats} repeats")
+    print(f"{'':>12}  {'min_ms':>9}  {'mean_ms':>9}")
+    for name, times in rows.items():
+        print(f"{name:>12}  {min(times):>9.2f}  {sum(times) / len(times):>9.2f}")
+    decode, load = rows["png decode"], rows["cache load"]
+    print(f"speedup (mean): {sum(decode) / max(sum(load), 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
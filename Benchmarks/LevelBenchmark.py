@@ -0,0 +1,266 @@
+"""
+Headless per-level benchmark: plays every map of Maps.LEVELS (and denser
+synthetic variants of them) for a fixed number of ticks with seeded random
+input, and reports the ms per tick spent in each subsystem of Level.update,
+in Level.draw, and the memory allocated per tick.
+
+Run from the repository root:
+    python -m Benchmarks.LevelBenchmark
+    python -m Benchmarks.LevelBenchmark --levels LEVEL_1 LEVEL_12 --variants crowded --ticks 1200
+    python -m Benchmarks.LevelBenchmark --out baseline.json
+    python -m Benchmarks.LevelBenchmark --compare baseline.json --threshold 0.15
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
+from AssetLoader import AssetLoader, ALL
+from Level import Level
+from Maps import LEVELS
+from Settings import WIDTH, HEIGHT
+
+# Subsystem name -> Level method timed for it, in update order
+SUBSYSTEMS = {
+    "animation": "update_animations",
+    "player": "update_player",
+    "particles": "update_particles",
+    "obstacles": "update_live_obstacles",
+    "enemies": "update_enemies",
+    "fruits": "update_fruits",
+    "rules": "update_rules",
+}
+
+# Synthetic variant name -> what is added to the free tiles of a level
+VARIANTS = {
+    "enemies": dict(enemies=12),
+    "boxes": dict(boxes=0.4),
+    "fruits": dict(fruits=20),
+    "crowded": dict(enemies=12, boxes=0.25, fruits=20),
+}
+
+ARROWS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+PLAYER_CLEARANCE = 3  # Nothing is added this close (in tiles) to the player
+
+
+class PressedKeys(frozenset):
+    """Stand-in for pygame.key.get_pressed(): keys[k] is True if k is in the set."""
+    __getitem__ = frozenset.__contains__
+
+
+class ScriptedInput:
+    """
+    Seeded random player: holds an arrow key for hold ticks, then picks another,
+    and taps space every space_every ticks.
+    """
+
+    def __init__(self, seed, hold=15, space_every=45):
+        self.rng = random.Random(seed)
+        self.hold = hold
+        self.space_every = space_every
+        self.tick = 0
+        self.arrow = None
+
+    def next(self):
+        if self.tick % self.hold == 0:
+            self.arrow = self.rng.choice(ARROWS)
+        pressed = {self.arrow}
+        if self.tick % self.space_every == 0:
+            pressed.add(pygame.K_SPACE)
+        self.tick += 1
+        return PressedKeys(pressed)
+
+
+def synthetic_level(rows, seed, enemies=0, boxes=0.0, fruits=0):
+    """
+    Copy of a map with extra enemies (both types), a fraction of the free tiles
+    turned into boxes, and extra strawberries and pineapples, all placed at
+    random on free tiles away from the player.
+    """
+    grid = [list(row) for row in rows]
+    pr, pc = [(r, row.rindex('P')) for r, row in enumerate(rows) if 'P' in row][-1]  # The last 'P' is the player
+    free = [(r, c) for r, row in enumerate(grid) for c, ch in enumerate(row)
+            if ch == ' ' and abs(r - pr) + abs(c - pc) > PLAYER_CLEARANCE]
+    rng = random.Random(seed)
+    rng.shuffle(free)
+    n_boxes = int(len(free) * boxes)
+    chars = ['ab'[i % 2] for i in range(enemies)] + ['BC'[i % 2] for i in range(fruits)] + ['#'] * n_boxes
+    for (r, c), ch in zip(free, chars):
+        grid[r][c] = ch
+    return ["".join(row) for row in grid]
+
+
+def benchmark_levels(names, variants, seed):
+    """(name, level number, map rows) of every level to run."""
+    runs = []
+    for name in names:
+        number = int(name.split('_')[1])
+        rows = LEVELS[name][1]
+        runs.append((name, number, rows))
+        for variant in variants:
+            runs.append((f"{name}+{variant}", number, synthetic_level(rows, seed + number, **VARIANTS[variant])))
+    return runs
+
+
+def new_level(rows, number, seed, full_redraw):
+    level = Level(rows, number, save_times=False, seed=seed)
+    if full_redraw:
+        level.renderer = None
+    return level
+
+
+def timed_method(method, totals, name):
+    def timed(*args):
+        start = time.perf_counter()
+        method(*args)
+        totals[name] += time.perf_counter() - start
+    return timed
+
+
+def play(rows, number, args, screen, measure_alloc=False):
+    """
+    Play one level for args.ticks ticks, restarting it whenever it ends.
+
+    Returns:
+        dict: Seconds per subsystem and draw (or allocation stats if measure_alloc), and outcomes.
+    """
+    keys = ScriptedInput(args.seed)
+    totals = dict.fromkeys(list(SUBSYSTEMS) + ["draw"], 0.0)
+    outcome = {"restarts": 0, "wins": 0}
+    allocated = 0
+
+    level = None
+    gc.collect()
+    gc_before = gc.get_stats()[0]["collections"]
+    if measure_alloc:
+        tracemalloc.start()
+    for tick in range(args.ticks):
+        if level is None or not level.running:
+            if level is not None:
+                outcome["restarts"] += 1
+                outcome["wins"] += level.won
+            level = new_level(rows, number, args.seed, args.renderer == "full")
+            if not measure_alloc:
+                for name, method in SUBSYSTEMS.items():
+                    setattr(level, method, timed_method(getattr(level, method), totals, name))
+            elif tick == 0:
+                retained_before = tracemalloc.get_traced_memory()[0]  # Memory held after the first level was built
+        if measure_alloc:
+            # Memory allocated during the tick, also if it was freed again
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            level.update(keys.next())
+            level.draw(screen)
+            allocated += tracemalloc.get_traced_memory()[1] - before
+        else:
+            level.update(keys.next())
+            start = time.perf_counter()
+            level.draw(screen)
+            totals["draw"] += time.perf_counter() - start
+
+    if measure_alloc:
+        retained = tracemalloc.get_traced_memory()[0] - retained_before
+        tracemalloc.stop()
+        return {"alloc_kb_per_tick": allocated / 1024 / args.ticks, "retained_kb": retained / 1024}
+    result = {name: seconds * 1000 / args.ticks for name, seconds in totals.items()}
+    result["gc_collections"] = gc.get_stats()[0]["collections"] - gc_before
+    result.update(outcome)
+    return result
+
+
+def bench_level(rows, number, args, screen):
+    """Best (lowest) ms/tick of every subsystem over args.repeats runs, plus allocations."""
+    runs = [play(rows, number, args, screen) for _ in range(args.repeats)]
+    row = {name: min(run[name] for run in runs) for name in list(SUBSYSTEMS) + ["draw"]}
+    row["update"] = sum(row[name] for name in SUBSYSTEMS)
+    row["tick"] = row["update"] + row["draw"]
+    for key in ("gc_collections", "restarts", "wins"):
+        row[key] = runs[0][key]
+    if not args.no_alloc:
+        row.update(play(rows, number, args, screen, measure_alloc=True))
+    return row
+
+
+# Metrics checked by --compare, with the smallest change that counts as a regression
+COMPARED = dict({name: 0.01 for name in list(SUBSYSTEMS) + ["draw", "update", "tick"]},
+                alloc_kb_per_tick=1.0, retained_kb=16.0)
+
+
+def compare(results, baseline, threshold):
+    """
+    List of (level, metric, baseline value, new value) for every metric that
+    got worse by more than threshold (a fraction) and by its minimum change.
+    """
+    regressions = []
+    for level, row in results["levels"].items():
+        old = baseline["levels"].get(level)
+        if old is None:
+            continue
+        for metric, min_change in COMPARED.items():
+            if metric in row and metric in old:
+                if row[metric] > old[metric] * (1 + threshold) and row[metric] - old[metric] > min_change:
+                    regressions.append((level, metric, old[metric], row[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", nargs="+", default=list(LEVELS), choices=list(LEVELS), metavar="LEVEL")
+    parser.add_argument("--variants", nargs="*", default=list(VARIANTS), choices=list(VARIANTS),
+                        help="synthetic variants to run for each level (none if given without names)")
+    parser.add_argument("--ticks", type=int, default=600, help="ticks per level (10 s of game time at 60 ticks/s)")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per level; the fastest is reported")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--renderer", choices=["dirty", "full"], default="dirty",
+                        help="dirty-rect renderer or a full redraw every frame")
+    parser.add_argument("--no-alloc", action="store_true", help="skip the (slow) tracemalloc pass")
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON file of an earlier run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    assets = AssetLoader()
+    assets.start()
+    assets.wait(ALL)
+    assets.shutdown()
+
+    results = {
+        "meta": {"ticks": args.ticks, "repeats": args.repeats, "seed": args.seed,
+                 "renderer": args.renderer, "pygame": pygame.version.ver},
+        "levels": {},
+    }
+    columns = list(SUBSYSTEMS) + ["draw", "tick"] + ([] if args.no_alloc else ["alloc_kb_per_tick"])
+    print(f"{'ms/tick':<18}" + "".join(f"{c[:10]:>11}" for c in columns) + f"{'restarts':>10}")
+    for name, number, rows in benchmark_levels(args.levels, args.variants, args.seed):
+        row = bench_level(rows, number, args, screen)
+        results["levels"][name] = row
+        print(f"{name:<18}" + "".join(f"{row[c]:>11.3f}" for c in columns) + f"{row['restarts']:>10}", flush=True)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for level, metric, old, new in regressions:
+            print(f"REGRESSION {level} {metric}: {old:.3f} -> {new:.3f} (+{(new / max(old, 1e-9) - 1) * 100:.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions against {args.compare} (threshold {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Memory soak test: restarts every level of Maps.LEVELS many times in a row
+headless, playing each run for a few ticks with seeded random input, and
+fails (exit status 1) if memory is not reclaimed across restarts.
+
+Memory is measured with MemoryTracker once the caches have warmed up and
+again after the last restart, both times with no level alive. The test fails
+when the traced memory grew by more than --max-growth-kb, or when more
+instances of any counted class (levels, sprites, surfaces...) are alive.
+Some growth is expected: bounded caches, such as NumPy's cache of small
+array buffers, keep filling slowly for hundreds of restarts.
+
+Run from the repository root:
+    python -m Benchmarks.LevelSoak
+    python -m Benchmarks.LevelSoak --levels LEVEL_3 LEVEL_12 --restarts 200 --ticks 120
+"""
+import argparse
+import sys
+import time
+
+from Benchmarks.LevelBenchmark import ScriptedInput, new_level  # Also selects the dummy SDL drivers
+import pygame
+from AssetLoader import AssetLoader, ALL
+from Maps import LEVELS
+from MemoryTracker import AllocationTracker, format_counts, format_site
+from Settings import WIDTH, HEIGHT
+
+
+def soak(rows, number, args, screen, tracker):
+    """
+    Build and play a level args.restarts times, dropping each run before the next one.
+
+    Returns:
+        tuple[dict, dict]: tracker.measure() after args.warmup restarts and after the last one.
+    """
+    baseline = None
+    for restart in range(1, args.restarts + 1):
+        level = new_level(rows, number, args.seed + restart, False)
+        keys = ScriptedInput(args.seed + restart)
+        for _ in range(args.ticks):
+            level.update(keys.next())
+            level.draw(screen)
+            if not level.running:
+                break
+        level = None
+        if restart == args.warmup:
+            baseline = tracker.measure()
+        elif restart % args.report_every == 0:
+            traced = tracker.measure()["traced"]
+            print(f"  {restart:>6} restarts: {(traced - baseline['traced']) / 1024:+.1f} KB", flush=True)
+    return baseline, tracker.measure()
+
+
+def leaks(baseline, final, max_growth_kb):
+    """Reasons the final measurement counts as a leak, empty if it does not."""
+    reasons = []
+    growth = (final["traced"] - baseline["traced"]) / 1024
+    if growth > max_growth_kb:
+        reasons.append(f"traced memory grew by {growth:.1f} KB (limit {max_growth_kb} KB)")
+    for name, count in final["counts"].items():
+        if count > baseline["counts"][name]:
+            reasons.append(f"{count - baseline['counts'][name]} more {name} alive")
+    return reasons
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", nargs="+", default=list(LEVELS), choices=list(LEVELS), metavar="LEVEL")
+    parser.add_argument("--restarts", type=int, default=1000, help="restarts per level")
+    parser.add_argument("--ticks", type=int, default=30, help="ticks played after each restart")
+    parser.add_argument("--warmup", type=int, default=20, help="restarts before the baseline is measured")
+    parser.add_argument("--report-every", type=int, default=100, help="restarts between progress lines")
+    parser.add_argument("--max-growth-kb", type=float, default=64.0,
+                        help="traced memory growth after the warmup that counts as a leak")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    if args.restarts <= args.warmup:
+        parser.error("--restarts must be larger than --warmup")
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    assets = AssetLoader()
+    assets.start()
+    assets.wait(ALL)
+    assets.shutdown()
+    tracker = AllocationTracker()
+    tracker.enable()
+
+    failed = []
+    for name in args.levels:
+        number = int(name.split('_')[1])
+        print(f"{name}: {args.restarts} restarts of {args.ticks} ticks", flush=True)
+        start = time.perf_counter()
+        baseline, final = soak(LEVELS[name][1], number, args, screen, tracker)
+        growth = (final["traced"] - baseline["traced"]) / 1024
+        print(f"{name}: {growth:+.1f} KB after warmup, "
+              f"{growth * 1024 / (args.restarts - args.warmup):+.1f} B per restart, "
+              f"{time.perf_counter() - start:.0f} s; live: {format_counts(final['counts'])}")
+        reasons = leaks(baseline, final, args.max_growth_kb)
+        if reasons:
+            failed.append(name)
+            print(f"LEAK {name}: " + "; ".join(reasons))
+            grown = [s for s in final["snapshot"].compare_to(baseline["snapshot"], "lineno") if s.size_diff > 0]
+            grown.sort(key=lambda s: s.size_diff, reverse=True)
+            for stat in grown[:tracker.top]:
+                print(f"  {stat.size_diff / 1024:+10.1f} KB {stat.count_diff:+7d} blocks  {format_site(stat)}")
+    tracker.disable()
+
+    if failed:
+        print(f"memory not reclaimed across restarts of {', '.join(failed)}")
+        sys.exit(1)
+    print(f"no leaks in {len(args.levels)} levels")
+
+
+if __name__ == "__main__":
+    main()
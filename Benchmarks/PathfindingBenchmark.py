@@ -0,0 +1,95 @@
+"""
+Compare Enemy2's BFS with the shared FlowField and the HierarchicalPathfinder
+on random grids of growing size.
+
+Run from the repository root:
+    python -m Benchmarks.PathfindingBenchmark
+    python -m Benchmarks.PathfindingBenchmark --sizes 100 500 1000 --queries 5
+"""
+import argparse
+import random
+import time
+import numpy as np
+from Pathfinding.FlowField import FlowField
+from Pathfinding.GridSearch import bfs_path
+from Pathfinding.HierarchicalPathfinder import HierarchicalPathfinder
+from TileGrid import TileGrid, STATIC
+
+
+def random_grid(size, density, seed):
+    """Square TileGrid with STATIC walls placed at random with the given density."""
+    rng = np.random.default_rng(seed)
+    return TileGrid.from_walls((rng.random((size, size)) < density).tolist())
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def bench_size(size, args):
+    grid = random_grid(size, args.density, args.seed + size)
+    rnd = random.Random(args.seed)
+    free = np.argwhere(grid.view() == 0)
+    pairs = []
+    for _ in range(args.queries):
+        a, b = free[rnd.randrange(len(free))], free[rnd.randrange(len(free))]
+        pairs.append(((int(a[0]), int(a[1])), (int(b[0]), int(b[1]))))
+
+    hpa = HierarchicalPathfinder(grid, args.cluster_size)
+    _, hpa_build = timed(hpa.build)
+
+    bfs_ms, hpa_ms, agree = [], [], 0
+    for start, goal in pairs:
+        path, ms = timed(bfs_path, grid, start, goal)
+        bfs_ms.append(ms)
+        prefix, ms = timed(hpa.find_path_prefix, start, goal)
+        hpa_ms.append(ms)
+        agree += bool(path) == bool(prefix)
+
+    field = FlowField(grid)
+    _, field_ms = timed(field.build, pairs[0][1])
+
+    rebuild_ms = []
+    for _ in range(args.toggles):
+        r, c = rnd.randrange(size), rnd.randrange(size)
+        if grid.has(r, c, STATIC):
+            grid.clear(r, c, STATIC)
+        else:
+            grid.set(r, c, STATIC)
+        _, ms = timed(hpa.invalidate, r, c)
+        rebuild_ms.append(ms)
+
+    return {
+        "size": size,
+        "bfs_query_ms": sum(bfs_ms) / len(bfs_ms),
+        "hpa_query_ms": sum(hpa_ms) / len(hpa_ms),
+        "hpa_build_ms": hpa_build,
+        "hpa_rebuild_ms": sum(rebuild_ms) / len(rebuild_ms) if rebuild_ms else 0.0,
+        "flow_field_build_ms": field_ms,
+        "reachability_agrees": f"{agree}/{len(pairs)}",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[13, 50, 100, 250, 500, 1000])
+    parser.add_argument("--queries", type=int, default=5, help="random start/goal pairs per size")
+    parser.add_argument("--toggles", type=int, default=20, help="tiles toggled to time cluster rebuilds")
+    parser.add_argument("--density", type=float, default=0.25, help="fraction of wall tiles")
+    parser.add_argument("--cluster-size", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    columns = ["size", "bfs_query_ms", "hpa_query_ms", "hpa_build_ms",
+               "hpa_rebuild_ms", "flow_field_build_ms", "reachability_agrees"]
+    print("  ".join(f"{c:>19}" for c in columns))
+    for size in args.sizes:
+        row = bench_size(size, args)
+        print("  ".join(f"{row[c]:>19.3f}" if isinstance(row[c], float) else f"{row[c]:>19}" for c in columns),
+              flush=True)
+
+
+if __name__ == "__main__":
+    main()
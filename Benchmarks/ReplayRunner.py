@@ -0,0 +1,77 @@
+"""
+Headless replay of recorded play sessions (python Main.py --record): plays
+every recording back through Level.update as fast as possible, checks that
+it ends the same way (won, lost or still running) on the same tick as when
+it was recorded, and reports the ms per tick (building the level included).
+
+Run from the repository root:
+    python -m Benchmarks.ReplayRunner
+    python -m Benchmarks.ReplayRunner Replays/level3-*.rpl --draw --repeats 5
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
+from AssetLoader import AssetLoader, ALL
+from Replay import Recording, REPLAY_DIR, OUTCOMES, outcome_of, replay
+from Settings import WIDTH, HEIGHT
+
+
+def run(path, args, screen):
+    """
+    Replay one recording args.repeats times.
+
+    Returns:
+        tuple[Recording, Level, float]: The recording, the level of the last replay and the best ms per tick.
+    """
+    recording = Recording.load(path)
+    best = float("inf")
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        level = replay(recording, screen if args.draw else None)
+        best = min(best, (time.perf_counter() - start) * 1000 / max(level.clock.ticks, 1))
+    return recording, level, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", help=f"recordings to play (default: every one in {REPLAY_DIR}/)")
+    parser.add_argument("--draw", action="store_true", help="also draw every tick")
+    parser.add_argument("--repeats", type=int, default=1, help="replays of each recording; the fastest is reported")
+    args = parser.parse_args()
+    paths = args.paths or sorted(glob.glob(os.path.join(REPLAY_DIR, "*.rpl")))
+    if not paths:
+        parser.error(f"no recordings in {REPLAY_DIR}/; record some with python Main.py --record")
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    assets = AssetLoader()
+    assets.start()
+    assets.wait(ALL)
+    assets.shutdown()
+
+    mismatches = 0
+    print(f"{'recording':<36}{'level':>6}{'ticks':>8}{'outcome':>12}{'ms/tick':>10}")
+    for path in paths:
+        recording, level, ms = run(path, args, screen)
+        ticks, outcome = level.clock.ticks, outcome_of(level)
+        print(f"{os.path.basename(path):<36}{recording.lvl_idx:>6}{ticks:>8}{OUTCOMES[outcome]:>12}{ms:>10.3f}")
+        if (ticks, outcome) != (recording.ticks, recording.outcome):
+            mismatches += 1
+            print(f"MISMATCH {path}: recorded {OUTCOMES[recording.outcome]} at tick {recording.ticks}, "
+                  f"replayed {OUTCOMES[outcome]} at tick {ticks}")
+
+    if mismatches:
+        print(f"{mismatches} of {len(paths)} recordings did not replay the same")
+        sys.exit(1)
+    print(f"all {len(paths)} recordings replayed the same")
+
+
+if __name__ == "__main__":
+    main()
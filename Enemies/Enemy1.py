@@ -2,30 +2,32 @@ from Settings import *
 import random
 from Images import IMAGES
 from Enemies.BaseEnemy import BaseEnemy
+from TileGrid import ENEMY
+from ExitMasks import DIRECTION_BITS, DIRECTIONS_BY_MASK
 
 class Enemy1(BaseEnemy):
     """
     Enemy1: moves in a fixed direction until hitting an obstacle,
-    then turns randomly to try a new direction.
+    then turns randomly to one of the free exits of its tile.
     """
 
     DIRECTIONS = ['up', 'right', 'down', 'left']
 
-    def __init__(self, x, y, grid, speed=1, anim_interval=200):
-        super().__init__(x, y, grid, speed, anim_interval)
+    def __init__(self, x, y, grid, timeline, exit_masks, rng=None, speed=1, anim_interval=200):
+        super().__init__(x, y, grid, timeline, speed, anim_interval)
+        self.exit_masks = exit_masks
+        self.rng = rng if rng is not None else random  # The level's seeded Random
 
-        # Load directional animation frames
-        self.frames = {
+        # Directional animation frames
+        self.direction = 'up'
+        self.load_clips({
             'up':    [IMAGES['E1_UP_1'], IMAGES['E1_UP_2'], IMAGES['E1_UP_3']],
             'right': [IMAGES['E1_RIGHT_1'], IMAGES['E1_RIGHT_2'], IMAGES['E1_RIGHT_3']],
             'down':  [IMAGES['E1_DOWN_1'], IMAGES['E1_DOWN_2'], IMAGES['E1_DOWN_3']],
             'left':  [IMAGES['E1_LEFT_1'], IMAGES['E1_LEFT_2'], IMAGES['E1_LEFT_3']],
-        }
-
-        self.direction = 'up'
-        self.image = self.frames[self.direction][0]
+        })
         self.rect = self.image.get_rect(topleft=(x, y))
-        self.grid[self.grid_pos[0]][self.grid_pos[1]] = 2
+        self.grid.occupy(self.grid_pos[0], self.grid_pos[1], ENEMY)
 
     @staticmethod
     def pixel_from_grid(grid_pos):
@@ -37,25 +39,21 @@ class Enemy1(BaseEnemy):
         """Main movement logic called each frame."""
         # Decide direction if not moving
         if not self.moving:
-            drow, dcol = DIRECTION_VECTORS[self.direction]
-            new_r = self.grid_pos[0] + drow
-            new_c = self.grid_pos[1] + dcol
+            row, col = self.grid_pos
+            exits = self.exit_masks.walk_mask(row, col) & ~self.exit_masks.occupied_mask(row, col, ENEMY)
+
+            if exits and not exits & DIRECTION_BITS[self.direction]:
+                # Obstacle: turn to a random free exit
+                self.direction = self.rng.choice(DIRECTIONS_BY_MASK[exits])
 
-            if (0 <= new_r < self.grid.shape[0] and
-                    0 <= new_c < self.grid.shape[1] and
-                    self.grid[new_r][new_c] != 1 and
-                    self.grid[new_r][new_c] != 2):
+            if exits & DIRECTION_BITS[self.direction]:
+                drow, dcol = DIRECTION_VECTORS[self.direction]
+                new_r, new_c = row + drow, col + dcol
                 # Free old tile and reserve new one
-                old_r, old_c = self.grid_pos
-                self.grid[old_r][old_c] = 0
-                self.grid[new_r][new_c] = 2
+                self.grid.move(ENEMY, self.grid_pos, (new_r, new_c))
                 self.grid_pos = [new_r, new_c]
                 self.target_pos = self.pixel_from_grid(self.grid_pos)
                 self.moving = True
-            else:
-                # Obstacle: pick a new random direction
-                self.direction = random.choice(self.DIRECTIONS)
-                self.frame_index = 0
 
         # Move toward target
         if self.moving:
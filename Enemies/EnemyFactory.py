@@ -6,10 +6,10 @@ class EnemyFactory:
     Factory to create enemy instances by type.
     """
     @staticmethod
-    def create(enemy_type: int, x, y, grid=None):
+    def create(enemy_type: int, x, y, grid=None, timeline=None, pathfinder=None, exit_masks=None, rng=None):
         if enemy_type == 1:
-            return Enemy1(x, y, grid)
+            return Enemy1(x, y, grid, timeline, exit_masks, rng)
         elif enemy_type == 2:
-            return Enemy2(x, y, grid)
+            return Enemy2(x, y, grid, timeline, pathfinder)
         else:
             raise ValueError(f"Unknown enemy type: {enemy_type}")
\ No newline at end of file
@@ -0,0 +1,69 @@
+from Settings import DIRECTION_VECTORS
+from TileGrid import BLOCKING
+
+DIRECTION_BITS = {'up': 1, 'right': 2, 'down': 4, 'left': 8}
+
+# Direction names for every 4-bit mask, so walkers pick among valid exits in O(1)
+DIRECTIONS_BY_MASK = [tuple(d for d, bit in DIRECTION_BITS.items() if mask & bit) for mask in range(16)]
+
+
+class ExitMasks:
+    """
+    Per-tile 4-bit exit masks derived from the walls of a TileGrid.
+
+    walk: bit set if the neighbouring tile in that direction is not BLOCKING.
+    jump: bit set if the neighbour is BLOCKING but the tile right behind it is
+          inside the map and not BLOCKING, i.e. a pineapple can fly over it.
+
+    Only walls are baked in; entities (enemies, player) still have to be checked
+    at decision time. Built once with rebuild() after the map is loaded and kept
+    up to date through on_tile_change(), a BLOCKING-layer grid subscriber.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.walk = bytearray(grid.rows * grid.cols)
+        self.jump = bytearray(grid.rows * grid.cols)
+
+    def rebuild(self):
+        for r in range(self.grid.rows):
+            for c in range(self.grid.cols):
+                self._compute(r, c)
+
+    def _compute(self, r, c):
+        grid = self.grid
+        walk = jump = 0
+        for direction, bit in DIRECTION_BITS.items():
+            dr, dc = DIRECTION_VECTORS[direction]
+            if not grid.get(r + dr, c + dc) & BLOCKING:
+                walk |= bit
+            elif grid.in_bounds(r + 2 * dr, c + 2 * dc) and not grid.get(r + 2 * dr, c + 2 * dc) & BLOCKING:
+                jump |= bit
+        i = r * grid.cols + c
+        self.walk[i] = walk
+        self.jump[i] = jump
+
+    def on_tile_change(self, row, col, old, new):
+        """A wall toggled: refresh the tiles that can walk into or jump over it."""
+        self._compute(row, col)
+        for dr, dc in DIRECTION_VECTORS.values():
+            for dist in (1, 2):
+                r, c = row + dr * dist, col + dc * dist
+                if self.grid.in_bounds(r, c):
+                    self._compute(r, c)
+
+    def walk_mask(self, row, col):
+        return self.walk[row * self.grid.cols + col]
+
+    def jump_mask(self, row, col):
+        return self.jump[row * self.grid.cols + col]
+
+    def occupied_mask(self, row, col, flags):
+        """Bits of the neighbours of (row, col) that hold any of the given flags."""
+        grid = self.grid
+        mask = 0
+        for direction, bit in DIRECTION_BITS.items():
+            dr, dc = DIRECTION_VECTORS[direction]
+            if grid.get(row + dr, col + dc) & flags:
+                mask |= bit
+        return mask
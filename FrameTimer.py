@@ -0,0 +1,240 @@
+import csv
+import os
+import time
+from array import array
+import pygame
+import TextCache
+from Settings import FPS
+
+PHASES = ('events', 'update', 'draw', 'present', 'wait')
+FRAME_HISTORY = 600             # Frames kept in the ring buffer (10 s at 60 FPS)
+FRAME_BUDGET_MS = 1000 / FPS    # Work (everything but 'wait') above this blows the frame
+WATCHDOG_COOLDOWN = 60          # Frames between two watchdog messages
+HISTOGRAM_MAX_MS = 100          # Histogram bins are 1 ms wide, the last one collects the rest
+CSV_FILE = "frame_times.csv"
+
+
+def percentile(sorted_values, q):
+    """Value below which a fraction q of the sorted values lies (nearest rank)."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class FrameTimer:
+    """
+    Time spent in each phase of a frame, in ms, for the last FRAME_HISTORY frames.
+
+    The game loop calls begin_frame(), lap(phase) after each phase and end_frame().
+    Optional details (e.g. the subsystems of Level.update) are timed with
+    split(name) from inside a phase and add up over the ticks of a frame.
+    Samples are kept in a fixed-size ring buffer, so recording allocates nothing.
+    While disabled every call returns at once, and no buffer is allocated.
+    """
+
+    def __init__(self, phases=PHASES, details=(), history=FRAME_HISTORY, budget_ms=FRAME_BUDGET_MS):
+        """
+        Args:
+            phases (tuple[str]): Phases of the frame, in loop order.
+            details (tuple[str]): Names passed to split(), or () to ignore splits.
+            history (int): Frames kept.
+            budget_ms (float): Frame budget checked by the watchdog.
+        """
+        self.columns = tuple(phases) + tuple(details)
+        self.phases = tuple(phases)
+        self.details = tuple(details)
+        self.column = {name: i for i, name in enumerate(self.columns)}
+        self.history = history
+        self.budget_ms = budget_ms
+        self.enabled = False
+        self.splitting = False  # enabled and timing details
+        self.ring = None        # history rows of len(columns) ms values, flattened
+        self.frames = 0         # Frames recorded since enable()
+        self.row = array('d', bytes(8 * len(self.columns)))  # The frame being recorded
+        self.zeros = array('d', bytes(8 * len(self.columns)))
+        self.mark = self.split_mark = 0.0
+        self.last_warning = -WATCHDOG_COOLDOWN
+        self.blown = 0          # Frames over budget since enable()
+
+    def enable(self, on=True):
+        if on and self.ring is None:
+            self.ring = array('d', bytes(8 * self.history * len(self.columns)))
+        self.enabled = on
+        self.splitting = on and bool(self.details)
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.mark = self.split_mark = time.perf_counter()
+
+    def lap(self, phase):
+        """Close phase: the time since the previous lap (or begin_frame) is added to it."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.row[self.column[phase]] += (now - self.mark) * 1000
+        self.mark = self.split_mark = now
+
+    def split(self, name=None):
+        """Add the time since the previous split to detail name; None only restarts the split."""
+        if not self.splitting:
+            return
+        now = time.perf_counter()
+        if name is not None:
+            self.row[self.column[name]] += (now - self.split_mark) * 1000
+        self.split_mark = now
+
+    def end_frame(self):
+        """Store the frame in the ring buffer and check it against the budget."""
+        if not self.enabled:
+            return
+        n = len(self.columns)
+        start = (self.frames % self.history) * n
+        self.ring[start:start + n] = self.row
+        self.frames += 1
+        self.watchdog(self.row)
+        self.row[:] = self.zeros
+
+    def watchdog(self, row):
+        """Log the phase (and detail) that took longest in a frame over the budget."""
+        work = sum(row[self.column[p]] for p in self.phases if p != 'wait')
+        if work <= self.budget_ms:
+            return
+        self.blown += 1
+        if self.frames - self.last_warning < WATCHDOG_COOLDOWN:
+            return
+        self.last_warning = self.frames
+        phase = max((p for p in self.phases if p != 'wait'), key=lambda p: row[self.column[p]])
+        message = (f"frame {self.frames} took {work:.1f} ms (budget {self.budget_ms:.1f} ms), "
+                   f"mostly {phase} ({row[self.column[phase]]:.1f} ms)")
+        if self.details and phase == 'update':
+            detail = max(self.details, key=lambda d: row[self.column[d]])
+            message += f", of which {detail} {row[self.column[detail]]:.1f} ms"
+        print(f"frame watchdog: {message}; {self.blown} frames over budget so far")
+
+    def samples(self, name):
+        """ms of name in the recorded frames, oldest first."""
+        if self.ring is None:
+            return []
+        n, i = len(self.columns), self.column[name]
+        count = min(self.frames, self.history)
+        first = self.frames - count
+        return [self.ring[((first + k) % self.history) * n + i] for k in range(count)]
+
+    def totals(self):
+        """Total ms of every recorded frame, oldest first."""
+        per_phase = [self.samples(p) for p in self.phases]
+        return [sum(frame) for frame in zip(*per_phase)]
+
+    def stats(self, name):
+        """(last, p50, p95, p99) of a phase, a detail or 'frame'."""
+        values = self.totals() if name == 'frame' else self.samples(name)
+        if not values:
+            return 0.0, 0.0, 0.0, 0.0
+        ordered = sorted(values)
+        return values[-1], percentile(ordered, 0.5), percentile(ordered, 0.95), percentile(ordered, 0.99)
+
+    def export_csv(self, path=CSV_FILE):
+        """
+        Write one row per recorded frame to path, and a histogram (frames per
+        1 ms bin of every column) next to it, to <name>_histogram.csv.
+
+        Returns:
+            tuple[str, str]: The paths written.
+        """
+        columns = {name: self.samples(name) for name in self.columns}
+        columns['frame'] = self.totals()
+        first = self.frames - len(columns['frame'])
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame'] + [f"{name}_ms" for name in columns])
+            for k, values in enumerate(zip(*columns.values())):
+                writer.writerow([first + k] + [f"{v:.4f}" for v in values])
+
+        root, ext = os.path.splitext(path)
+        histogram_path = f"{root}_histogram{ext or '.csv'}"
+        bins = {name: [0] * (HISTOGRAM_MAX_MS + 1) for name in columns}
+        for name, values in columns.items():
+            for v in values:
+                bins[name][min(int(v), HISTOGRAM_MAX_MS)] += 1
+        with open(histogram_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(['from_ms'] + list(columns))
+            for b in range(HISTOGRAM_MAX_MS + 1):
+                writer.writerow([b] + [bins[name][b] for name in columns])
+        return path, histogram_path
+
+
+class FrameTimerOverlay:
+    """
+    Panel with the last frame time, p50/p95/p99 and a sparkline of every phase.
+    The panel is rebuilt every `refresh` frames and blitted in between. It is
+    opaque: the dirty-rect renderer does not redraw what is under it, so a
+    translucent panel would blend onto its own previous copy every frame.
+    """
+
+    LINE_HEIGHT = 16
+    SPARK_WIDTH = 120
+    FONT_SIZE = 16
+
+    def __init__(self, timer, pos=(10, 10), refresh=15):
+        self.timer = timer
+        self.pos = pos
+        self.refresh = refresh
+        self.visible = False
+        self.timed_before = False  # Whether timing was on before the overlay was shown
+        self.panel = None
+        self.built_at = None
+
+    def toggle(self):
+        """Show or hide the overlay; timing is recorded at least while it is shown."""
+        self.visible = not self.visible
+        if self.visible:
+            self.timed_before = self.timer.enabled
+            self.timer.enable()
+        else:
+            self.timer.enable(self.timed_before)
+        self.panel = None
+
+    def build(self):
+        timer = self.timer
+        font = TextCache.get_font(self.FONT_SIZE, None)
+        rows = ['frame'] + list(timer.phases) + [f"  {d}" for d in timer.details]
+        text_width = 300
+        width = text_width + self.SPARK_WIDTH + 10
+        panel = pygame.Surface((width, (len(rows) + 1) * self.LINE_HEIGHT + 6))
+        panel.fill((20, 20, 20))
+        for x, label in ((5, "ms"), (85, "now"), (137, "p50"), (189, "p95"), (241, "p99")):
+            panel.blit(font.render(label, True, (200, 200, 200)), (x, 3))
+        for i, row in enumerate(rows, start=1):
+            name = row.strip()
+            last, p50, p95, p99 = timer.stats(name)
+            over = name == 'frame' and p95 > timer.budget_ms
+            color = (255, 120, 120) if over else (255, 255, 255)
+            y = 3 + i * self.LINE_HEIGHT
+            panel.blit(font.render(f"{row:<10}", True, color), (5, y))
+            for j, value in enumerate((last, p50, p95, p99)):
+                panel.blit(font.render(f"{value:6.2f}", True, color), (85 + j * 52, y))
+            self.sparkline(panel, timer.totals() if name == 'frame' else timer.samples(name),
+                           pygame.Rect(text_width, y, self.SPARK_WIDTH, self.LINE_HEIGHT - 3))
+        return panel
+
+    def sparkline(self, panel, values, rect):
+        """The last rect.width values as a line, scaled to the frame budget (clipped above it)."""
+        values = values[-rect.width:]
+        if len(values) < 2:
+            return
+        scale = (rect.height - 1) / self.timer.budget_ms
+        points = [(rect.x + k, rect.bottom - 1 - min(v * scale, rect.height - 1)) for k, v in enumerate(values)]
+        pygame.draw.line(panel, (90, 90, 90), rect.topleft, rect.topright)  # Budget line
+        pygame.draw.lines(panel, (120, 220, 120), False, points)
+
+    def draw(self, surface):
+        """Draw the panel if visible. Returns its screen rect, or None."""
+        if not self.visible:
+            return None
+        frames = self.timer.frames
+        if self.panel is None or frames - self.built_at >= self.refresh:
+            self.panel = self.build()
+            self.built_at = frames
+        return surface.blit(self.panel, self.pos)
@@ -8,14 +8,14 @@ class FruitFactory:
     Factory to create fruit instances by type.
     """
     @staticmethod
-    def create(fruit_type, x, y, grid=None):
+    def create(fruit_type, x, y, grid=None, timeline=None, exit_masks=None, rng=None):
         ft = fruit_type.lower()
         if ft == 'strawberry':
-            return Strawberry(x, y)
+            return Strawberry(x, y, timeline, grid, exit_masks, rng)
         elif ft == 'orange':
             # Orange class must be defined/imported
             return Orange(x, y)
         elif ft == 'pineapple':
-            return Pineapple(x, y, grid)
+            return Pineapple(x, y, grid, timeline, exit_masks, rng)
         else:
             raise ValueError(f"Unknown fruit type: {fruit_type}")
\ No newline at end of file
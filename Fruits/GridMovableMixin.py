@@ -1,13 +1,15 @@
 from Settings import *
+from TileGrid import FRUIT
 
 class GridMovableMixin:
     """
     A mixin class that adds smooth grid-based movement logic to a sprite.
-    Requires the host class to define `rect`, `frames`, `frame_index`, `image`, and `animate()`.
+    Requires the host class to define `rect`, `animator`, and `animate()`.
     """
-    def __init__(self, move_speed=2):
+    def __init__(self, move_speed=2, grid=None):
         # AnimatedFruit.__init__ was called first
         self.move_speed = move_speed
+        self.grid = grid # TileGrid whose FRUIT layer follows grid_pos, if given
         row = (self.rect.top - MAP_OFFSET) // TILE_SIZE
         col = (self.rect.left - MAP_OFFSET) // TILE_SIZE
         self.grid_pos = [row, col]
@@ -25,11 +27,12 @@ class GridMovableMixin:
             drow, dcol = DIRECTION_VECTORS[self.next_direction]
             new_r = self.grid_pos[0] + drow
             new_c = self.grid_pos[1] + dcol
-            test_rect = self.rect.move(dcol * TILE_SIZE, drow * TILE_SIZE)
-            if not any(test_rect.colliderect(o.rect) for o in obstacles):
+            if not obstacles.blocked(new_r, new_c):
                 px = new_c * TILE_SIZE + MAP_OFFSET
                 py = new_r * TILE_SIZE + MAP_OFFSET
                 self.target_pos = [px, py]
+                if self.grid is not None:
+                    self.grid.move(FRUIT, self.grid_pos, (new_r, new_c))
                 self.grid_pos = [new_r, new_c]
                 self.moving = True
             self.next_direction = None
@@ -47,5 +50,4 @@ class GridMovableMixin:
                 self.moving = False
             self.animate()
         else:
-            self.frame_index = 0
-            self.image = self.frames[0]
+            self.animator.stop()
@@ -1,5 +1,5 @@
-import pygame
 from Images import IMAGES
+from Settings import *
 
 class Orange(pygame.sprite.Sprite):
     """
@@ -9,4 +9,5 @@ class Orange(pygame.sprite.Sprite):
         super().__init__()
         self.image = IMAGES[png]
         self.rect = self.image.get_rect(topleft=(x, y))
+        self.grid_pos = [(y - MAP_OFFSET) // TILE_SIZE, (x - MAP_OFFSET) // TILE_SIZE]
         self.collectable = True
\ No newline at end of file
@@ -1,51 +1,50 @@
 import random
 from Images import IMAGES
 from Settings import *
+from Animation import AnimatedSprite, Animator, Clip, LOOP, ONCE, PINGPONG
+from TileGrid import OCCUPIED, FRUIT
+from ExitMasks import DIRECTION_BITS, DIRECTIONS_BY_MASK
 
-class Pineapple(pygame.sprite.Sprite):
+class Pineapple(AnimatedSprite):
     """
     A special fruit that can walk, fly over obstacles, and land.
     It animates differently depending on the current movement state.
     """
 
-    def __init__(self, x, y, grid):
+    def __init__(self, x, y, grid, timeline, exit_masks, rng=None):
         super().__init__()
+        self.exit_masks = exit_masks
+        self.rng = rng if rng is not None else random  # The level's seeded Random
         self.collectable = True
 
-        # Animation frames for different states
-        self.walk_frames = [
+        # Animation clips for the different states, intervals in ms
+        self.walk_clip = Clip([
             IMAGES['PINEAPPLE_R_1'],
             IMAGES['PINEAPPLE_R_2'],
             IMAGES['PINEAPPLE_R_3']
-        ]
-        self.departure_frames = [
+        ], 100, PINGPONG)
+        self.departure_clip = Clip([
             IMAGES['PINEAPPLE_DEPART_0'],
             IMAGES['PINEAPPLE_DEPART_1'],
             IMAGES['PINEAPPLE_DEPART_2']
-        ]
-        self.fly_frames = [
+        ], 350, ONCE)
+        self.fly_clip = Clip([
             IMAGES['PINEAPPLE_FLY_1'],
             IMAGES['PINEAPPLE_FLY_2']
-        ]
-        self.landing_frames = [
+        ], 75, LOOP)
+        self.landing_clip = Clip([
             IMAGES['PINEAPPLE_LAND_1'],
             IMAGES['PINEAPPLE_LAND_2'],
             IMAGES['PINEAPPLE_LAND_3']
-        ]
-
-        # Animation intervals (ms)
-        self.walk_interval = 100
-        self.departure_interval = 350
-        self.fly_interval = 75
-        self.landing_interval = 350
+        ], 350, ONCE)
 
         # Starting image and position
-        self.image = self.walk_frames[0]
+        self.animator = Animator(timeline, self.walk_clip, self)
         self.rect = self.image.get_rect(topleft=(x, y))
         self.grid = grid
         self.grid_pos = [(y - MAP_OFFSET) // TILE_SIZE, (x - MAP_OFFSET) // TILE_SIZE]
         self.target_pos = [x, y]
-        self.direction = random.choice(list(DIRECTION_VECTORS.keys()))
+        self.direction = self.rng.choice(list(DIRECTION_VECTORS.keys()))
         self.speed = 2
         self.fly_speed = 1
 
@@ -56,27 +55,16 @@ class Pineapple(pygame.sprite.Sprite):
         self.landing = False
 
         self.fly_target = None
-        self.frame_index = 0
-        self.anim_time = pygame.time.get_ticks()
-        self.anim_dir = 1
 
 
     def update(self, obstacles):
-        now = pygame.time.get_ticks()
-
         # DEPARTURE phase: plays departure animation before flying
         if self.departing:
             self.collectable = False
-            if now - self.anim_time >= self.departure_interval:
-                self.anim_time = now
-                self.frame_index += 1
-                if self.frame_index < len(self.departure_frames):
-                    self.image = self.departure_frames[self.frame_index]
-                else:
-                    self.departing = False
-                    self.flying = True
-                    self.frame_index = 0
-                    self.image = self.fly_frames[0]
+            if self.animator.done:
+                self.departing = False
+                self.flying = True
+                self.animator.play(self.fly_clip)
             return
 
         # FLYING phase: moves in air to the new tile
@@ -86,32 +74,19 @@ class Pineapple(pygame.sprite.Sprite):
             self.rect.x += max(-self.fly_speed, min(self.fly_speed, dx))
             self.rect.y += max(-self.fly_speed, min(self.fly_speed, dy))
 
-            if now - self.anim_time >= self.fly_interval:
-                self.anim_time = now
-                self.frame_index = (self.frame_index + 1) % len(self.fly_frames)
-                self.image = self.fly_frames[self.frame_index]
-
             if abs(dx) <= self.fly_speed and abs(dy) <= self.fly_speed:
                 self.rect.topleft = self.fly_target
                 self.flying = False
                 self.landing = True
-                self.frame_index = 0
-                self.anim_time = now
-                self.image = self.landing_frames[0]
+                self.animator.play(self.landing_clip)
             return
 
         # LANDING phase: plays landing animation
         if self.landing:
             self.collectable = True
-            if now - self.anim_time >= self.landing_interval:
-                self.anim_time = now
-                self.frame_index += 1
-                if self.frame_index < len(self.landing_frames):
-                    self.image = self.landing_frames[self.frame_index]
-                else:
-                    self.landing = False
-                    self.frame_index = 0
-                    self.image = self.walk_frames[0]
+            if self.animator.done:
+                self.landing = False
+                self.animator.stop(self.walk_clip)
             return
 
         # regular tile-to-tile movement
@@ -121,56 +96,49 @@ class Pineapple(pygame.sprite.Sprite):
             self.rect.x += max(-self.speed, min(self.speed, dx))
             self.rect.y += max(-self.speed, min(self.speed, dy))
 
-            if now - self.anim_time >= self.walk_interval:
-                self.anim_time = now
-                if self.frame_index == len(self.walk_frames) - 1:
-                    self.anim_dir = -1
-                elif self.frame_index == 0:
-                    self.anim_dir = 1
-                self.frame_index += self.anim_dir
-                self.image = self.walk_frames[self.frame_index]
-
             if abs(dx) <= self.speed and abs(dy) <= self.speed:
                 self.rect.topleft = self.target_pos
                 self.moving = False
-                self.frame_index = 0
-                self.image = self.walk_frames[0]
+                self.animator.stop(self.walk_clip)
             return
 
-        # CHOOSE NEXT STEP
-        dr, dc = DIRECTION_VECTORS[self.direction]
+        # CHOOSE NEXT STEP: keep going while possible, otherwise turn to a random valid exit
         r, c = self.grid_pos
-        nr, nc = r + dr, c + dc
+        walk = self.exit_masks.walk_mask(r, c)
+        jump = self._jump_exits(r, c)
+        if not (walk | jump) & DIRECTION_BITS[self.direction]:
+            options = DIRECTIONS_BY_MASK[walk | jump]
+            if not options:
+                return
+            self.direction = self.rng.choice(options)
+        dr, dc = DIRECTION_VECTORS[self.direction]
 
-        if not (0 <= nr < self.grid.shape[0] and 0 <= nc < self.grid.shape[1]):
-            self._change_direction()
+        # Wall ahead: fly over it
+        if not walk & DIRECTION_BITS[self.direction]:
+            fr, fc = r + 2 * dr, c + 2 * dc
+            self.departing = True
+            self.fly_target = [fc * TILE_SIZE + MAP_OFFSET, fr * TILE_SIZE + MAP_OFFSET]
+            self.grid.move(FRUIT, self.grid_pos, (fr, fc))
+            self.grid_pos = [fr, fc]
+            self.animator.play(self.departure_clip)
             return
 
-        # If wall ahead, check if it can fly over
-        if self.grid[nr][nc] == 1:
-            fr, fc = nr + dr, nc + dc
-            if 0 <= fr < self.grid.shape[0] and 0 <= fc < self.grid.shape[1] and self.grid[fr][fc] == 0:
-                self.departing = True
-                self.fly_target = [fc * TILE_SIZE + MAP_OFFSET, fr * TILE_SIZE + MAP_OFFSET]
-                self.grid_pos = [fr, fc]
-                self.frame_index = 0
-                self.anim_time = now
-                self.image = self.departure_frames[0]
-                return
-            else:
-                self._change_direction()
-                return
-
         # Normal walk if next tile is free
+        nr, nc = r + dr, c + dc
+        self.grid.move(FRUIT, self.grid_pos, (nr, nc))
         self.grid_pos = [nr, nc]
         self.target_pos = [nc * TILE_SIZE + MAP_OFFSET, nr * TILE_SIZE + MAP_OFFSET]
         self.moving = True
-        self.frame_index = 0
-        self.anim_time = now
-        self.image = self.walk_frames[0]
-
-    def _change_direction(self):
-        self.direction = random.choice(list(DIRECTION_VECTORS.keys()))
-
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
+        self.animator.play(self.walk_clip)
+
+    def _jump_exits(self, r, c):
+        """Jump exits of (r, c) whose landing tile is not taken by the player or an enemy."""
+        jump = self.exit_masks.jump_mask(r, c)
+        for direction in DIRECTIONS_BY_MASK[jump]:
+            dr, dc = DIRECTION_VECTORS[direction]
+            if not self.grid.is_free(r + 2 * dr, c + 2 * dc, OCCUPIED):
+                jump &= ~DIRECTION_BITS[direction]
+        return jump
+
+    def draw(self, surface, pos=None):
+        surface.blit(self.image, self.rect if pos is None else pos)
@@ -2,15 +2,21 @@ import random
 
 from Fruits.GridMovableMixin import GridMovableMixin
 from Fruits.BaseFruit import BaseFruit
+from ExitMasks import DIRECTIONS_BY_MASK
 
 class Strawberry(GridMovableMixin, BaseFruit):
-    def __init__(self, x, y):
+    def __init__(self, x, y, timeline, grid, exit_masks, rng=None):
         frame_keys = ['STRAWBERRY_1', 'STRAWBERRY_2', 'STRAWBERRY_3', 'STRAWBERRY_4', 'STRAWBERRY_5', 'STRAWBERRY_6']
-        BaseFruit.__init__(self, x, y, frame_keys, anim_interval=180)
-        GridMovableMixin.__init__(self, move_speed=1)
+        BaseFruit.__init__(self, x, y, frame_keys, timeline, anim_interval=180)
+        GridMovableMixin.__init__(self, move_speed=1, grid=grid)
         self.collectable = True
+        self.exit_masks = exit_masks
+        self.rng = rng if rng is not None else random  # The level's seeded Random
 
     def update(self, obstacles):
-        direction = random.choice(['left', 'right', 'up', 'down'])
-        self.move(direction)
+        # Roll a new direction only between moves, and only among the free exits
+        if not self.moving:
+            exits = self.exit_masks.walk_mask(*self.grid_pos)
+            if exits:
+                self.move(self.rng.choice(DIRECTIONS_BY_MASK[exits]))
         super().update(obstacles)
@@ -1,5 +1,10 @@
-import sys, Images
+import sys, time, importlib, Audio, TextCache
 from Settings import *
+from AssetLoader import AssetLoader, StartupTrace, ALL
+from FrameTimer import FrameTimer, FrameTimerOverlay, CSV_FILE
+from Profiler import ProfileCapture
+from MemoryTracker import AllocationTracker
+from Replay import InputRecorder
 from States import MainMenuState
 
 class Game:
@@ -7,15 +12,47 @@ class Game:
     Main Game class responsible for initializing the game,
     managing the current state, and running the main loop.
     """
-    def __init__(self):
+    def __init__(self, trace=None, frame_timer=None, frame_csv=None, profiler=None, memory=None, recorder=None):
+        """
+        Args:
+            trace (StartupTrace): Collects startup timings, reported once startup is done if enabled.
+            frame_timer (FrameTimer): Per-phase frame timings; a disabled one by default.
+                F3 toggles its overlay and F4 exports it to CSV_FILE.
+            frame_csv (str): Export the frame timings to this CSV file on exit.
+            profiler (ProfileCapture): Profiler started and stopped with F5; a sampling one by default.
+            memory (AllocationTracker): Reports memory on level enter and exit; a disabled one by default.
+            recorder (InputRecorder): Records the input of every level played; a disabled one by default.
+        """
+        self.trace = trace if trace is not None else StartupTrace()
+        self.frame_timer = frame_timer if frame_timer is not None else FrameTimer()
+        self.frame_overlay = FrameTimerOverlay(self.frame_timer)
+        self.frame_csv = frame_csv
+        self.profiler = profiler if profiler is not None else ProfileCapture()
+        self.memory = memory if memory is not None else AllocationTracker()
+        self.recorder = recorder if recorder is not None else InputRecorder()
+        start = time.perf_counter()
         pygame.init()
         pygame.display.set_caption("Forest")
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        Images.load_images()
+        self.trace.span("pygame init and window", start)
+
+        # Images load in the background; a state is drawn once its own ASSETS are in
+        self.assets = AssetLoader(trace=self.trace)
+        self.assets.start(first=MainMenuState.ASSETS)
+        self.assets.submit("import numpy", importlib.import_module, "numpy")  # Needed by the first level
+        start = time.perf_counter()
+        Audio.load_sounds()
+        self.trace.span("load sounds", start)
+
         self.clock = pygame.time.Clock()
-        self.current_state = MainMenuState(self)
+        self.first_frame = True
         self.current_lvl = None
         self.level = None
+        self.change_state(MainMenuState(self))
+
+        # Fraction of a logic tick elapsed since the last update, used to interpolate sprites
+        self.render_alpha = 1.0
+        self.loop_stats = {"ticks": 0, "draws": 0, "skipped_draws": 0, "dropped_ticks": 0}
 
     def change_state(self, new_state):
         """
@@ -25,22 +62,116 @@ class Game:
             new_state: An instance of a class that inherits from GameState.
         """
         self.current_state = new_state
+        self.profiler.set_tag(type(new_state).__name__, self.current_lvl if new_state.IN_LEVEL else None)
+        if new_state.IN_LEVEL:
+            self.memory.enter_level(self.level, self.current_lvl)
+        else:
+            self.recorder.finish()
+            self.memory.exit_level()
 
     def run(self):
         """
-        Run the main game loop: handle input, update state, and draw each frame.
+        Run the main game loop with a fixed logic timestep.
+
+        Logic ticks (TICK_MS each) are run as often as wall time requires, so
+        gameplay speed does not depend on the render cost. When the game falls
+        behind, several ticks run before a single draw (skipped draws) and at most
+        MAX_TICKS_PER_FRAME are run per frame; the rest of the backlog is dropped.
         """
+        stats = self.loop_stats
+        timer = self.frame_timer
         running = True
+        lag = 0.0
+        previous = time.perf_counter()
         while running:
+            timer.begin_frame()
+            current = time.perf_counter()
+            lag += (current - previous) * 1000
+            previous = current
+
             keys = pygame.key.get_pressed()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.KEYDOWN and event.key in (pygame.K_F3, pygame.K_F4, pygame.K_F5):
+                    self.handle_debug_key(event.key)
                 self.current_state.handle_input(event)
+            timer.lap('events')
+
+            ticks = 0
+            while lag >= TICK_MS and ticks < MAX_TICKS_PER_FRAME:
+                self.current_state.update(keys)
+                lag -= TICK_MS
+                ticks += 1
+            if lag >= TICK_MS:
+                # Too far behind to catch up: drop the backlog instead of spiralling
+                stats["dropped_ticks"] += int(lag // TICK_MS)
+                lag %= TICK_MS
+            stats["ticks"] += ticks
+            stats["skipped_draws"] += max(0, ticks - 1)
+            timer.lap('update')
 
-            self.current_state.update(keys)
-            self.current_state.draw(self.screen)
-            pygame.display.flip()
+            self.render_alpha = lag / TICK_MS
+            if self.assets.ready(self.current_state.ASSETS):
+                rects = self.current_state.draw(self.screen)
+                self.trace_startup()
+            else:
+                self.screen.fill(BLACK) # Still loading
+                rects = None
+            overlay = self.frame_overlay.draw(self.screen)
+            if rects is not None and overlay is not None:
+                rects.append(overlay)
+            timer.lap('draw')
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)  # Only the areas the state redrew
+            stats["draws"] += 1
+            timer.lap('present')
             self.clock.tick(FPS)
+            timer.lap('wait')
+            timer.end_frame()
+            self.profiler.check()
+            self.memory.end_frame()
+        print(self.report_loop_stats())
+        if self.frame_timer.enabled:
+            print(TextCache.report())
+        self.profiler.stop()
+        self.recorder.finish()
+        self.memory.disable()
+        if self.frame_csv and self.frame_timer.frames:
+            print("frame timings written to %s and %s" % self.frame_timer.export_csv(self.frame_csv))
+        self.assets.shutdown()
         pygame.quit()
-        sys.exit()
\ No newline at end of file
+        sys.exit()
+
+    def handle_debug_key(self, key):
+        """
+        F3 shows or hides the frame timing overlay, F4 exports the timings to CSV_FILE,
+        F5 starts or stops a profile capture.
+        """
+        if key == pygame.K_F5:
+            self.profiler.toggle()
+        elif key == pygame.K_F3:
+            self.frame_overlay.toggle()
+            if not self.frame_overlay.visible:
+                # The overlay is not part of any state's drawing: have the screen redrawn under it
+                pygame.event.post(pygame.event.Event(pygame.WINDOWEXPOSED))
+        elif self.frame_timer.frames:
+            print("frame timings written to %s and %s" % self.frame_timer.export_csv(CSV_FILE))
+
+    def trace_startup(self):
+        """Mark the first drawn frame and print the startup trace once every image is loaded."""
+        if self.first_frame:
+            self.first_frame = False
+            self.trace.mark("first frame")
+        if self.trace.enabled and self.assets.ready(ALL):
+            self.trace.mark("startup done")
+            print(self.trace.report())
+            self.trace.enabled = False
+
+    def report_loop_stats(self):
+        """Return a one-line summary of the logic ticks and draws done by run()."""
+        s = self.loop_stats
+        return (f"ticks: {s['ticks']}, draws: {s['draws']}, "
+                f"skipped draws: {s['skipped_draws']}, dropped ticks: {s['dropped_ticks']}")
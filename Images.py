@@ -1,14 +1,159 @@
-import os, pygame
+import os, json, mmap, struct, hashlib, pygame
+from Atlas import is_opaque
 IMAGES = {}
+VARIANTS = {}  # (key, make, args) -> derived image(s), shared process-wide
+OPAQUE = set() # Keys of images without transparent pixels, as recorded in the cache
 
-def load_images():
+IMAGE_DIR = 'Images'
+CACHE_FILE = os.path.join('Assets', 'image_cache.bin')  # Decoded pixels of every image, built on demand
+CACHE_MAGIC = b'FGIC'
+CACHE_VERSION = 2
+CACHE_FORMAT = 'BGRA'  # Byte order of convert_alpha() surfaces on little-endian machines
+_cache_map = None      # Keeps the mapped cache alive while surfaces use its memory
+
+
+def list_sources():
+    """Image key -> path of every .png in /Images."""
+    image_dir = os.path.join(os.getcwd(), IMAGE_DIR)
+    return {file[:-4].upper(): os.path.join(image_dir, file)
+            for file in sorted(os.listdir(image_dir)) if file.endswith('.png')}
+
+
+def decode_pngs(sources):
+    return {key: pygame.image.load(path).convert_alpha() for key, path in sources.items()}
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def write_cache(images, sources, path=CACHE_FILE):
+    """
+    Write the decoded images to path, see write_cache_file().
+
+    This reads (and locks) the surfaces through snapshot_pixels(), so call it from
+    the thread that draws them, never from a pool: a surface locked by another
+    thread fails to blit. To write in the background, hand the snapshot to
+    write_cache_file() instead, as AssetLoader does.
+    """
+    write_cache_file(snapshot_pixels(images), sources, path)
+
+
+def snapshot_pixels(images):
+    """
+    Copy the pixels of every image for write_cache_file().
+
+    This reads (and locks) the surfaces, so call it from the thread that draws
+    them; only the returned bytes may be handed to another thread.
+
+    Returns:
+        list[tuple[str, tuple[int, int], bool, bytes]]: Key, size, opacity and CACHE_FORMAT pixels.
+    """
+    snapshot = []
+    for key, surf in images.items():
+        if surf.get_flags() & pygame.SRCALPHA:
+            opaque = is_opaque(surf)
+        else:
+            opaque, surf = True, surf.convert_alpha()  # Gives the alpha bytes a defined value
+        snapshot.append((key, surf.get_size(), opaque, pygame.image.tobytes(surf, CACHE_FORMAT)))
+    return snapshot
+
+
+def write_cache_file(snapshot, sources, path=CACHE_FILE):
+    """
+    Write images copied by snapshot_pixels() to path: magic, version, header length,
+    a JSON header (per image: name, size, format, opacity, offset; per source: mtime,
+    size, hash) and the raw pixel buffers, each aligned to 16 bytes.
+    Touches no surface, so it can run on any thread.
+    """
+    entries, chunks, offset = [], [], 0
+    for key, size, opaque, data in snapshot:
+        entries.append({"name": key, "size": size, "format": CACHE_FORMAT, "opaque": opaque,
+                        "offset": offset, "length": len(data)})
+        padding = -len(data) % 16
+        chunks.append(data + bytes(padding))
+        offset += len(data) + padding
+    files = {}
+    for key, src in sources.items():
+        st = os.stat(src)
+        files[os.path.basename(src)] = [st.st_mtime_ns, st.st_size, file_hash(src)]
+    header = json.dumps({"images": entries, "sources": files}).encode()
+    header += b" " * (-(12 + len(header)) % 16)  # JSON allows trailing whitespace
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(CACHE_MAGIC + struct.pack('<II', CACHE_VERSION, len(header)) + header)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp, path)
+
+
+def cache_is_fresh(cached, sources):
+    """True if every source PNG is the one the cache was built from (same mtime and size, or same hash)."""
+    if set(cached) != {os.path.basename(src) for src in sources.values()}:
+        return False
+    for src in sources.values():
+        mtime, size, digest = cached[os.path.basename(src)]
+        st = os.stat(src)
+        if (st.st_mtime_ns, st.st_size) != (mtime, size) and file_hash(src) != digest:
+            return False
+    return True
+
+
+def load_cache(sources, path=CACHE_FILE):
     """
-    Load all .png images from /Images into a dictionary
+    Create surfaces straight from the memory-mapped cache file.
+    Returns None if the cache is missing, unreadable or stale.
     """
-    global IMAGES
-    image_dir = os.path.join(os.getcwd(), 'Images')
-    for file in os.listdir(image_dir):
-        if file.endswith('.png'):
-            key = file[:-4].upper()
-            IMAGES[key] = pygame.image.load(os.path.join(image_dir, file)).convert_alpha()
+    global _cache_map
+    try:
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, (version, header_len) = data[:4], struct.unpack('<II', data[4:12])
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            return None
+        header = json.loads(data[12:12 + header_len])
+        if not cache_is_fresh(header["sources"], sources):
+            return None
+    except (struct.error, ValueError, KeyError):
+        return None
 
+    base = 12 + header_len
+    view = memoryview(data)
+    alpha_masks = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+    images = {}
+    for entry in header["images"]:
+        start = base + entry["offset"]
+        surf = pygame.image.frombuffer(view[start:start + entry["length"]], entry["size"], entry["format"])
+        if surf.get_masks() != alpha_masks:
+            surf = surf.convert_alpha()  # Display uses another pixel layout
+        images[entry["name"]] = surf
+        if entry["opaque"]:
+            OPAQUE.add(entry["name"])
+    _cache_map = data
+    return images
+
+
+def get_variant(key, make, *args):
+    """
+    Return images derived from IMAGES[key] (scaled, rotated, ...), built once per
+    process by make(image, *args) and shared by every caller.
+    """
+    cache_key = (key, make, args)
+    variant = VARIANTS.get(cache_key)
+    if variant is None:
+        variant = VARIANTS[cache_key] = make(IMAGES[key], *args)
+    return variant
+
+
+def growth_frames(image, steps, size):
+    """
+    Frames of an image growing from 1/steps to its full size (size x size),
+    for use with get_variant().
+    """
+    return tuple(pygame.transform.scale(image, (size * i // steps, size * i // steps))
+                 for i in range(1, steps + 1))
@@ -1,13 +1,22 @@
 import random
-import numpy as np
+from itertools import chain
+from Animation import Timeline
 from Fruits.FruitFactory import FruitFactory
-from Fruits.Pineapple import Pineapple
+from FrameTimer import FrameTimer
 from Images import IMAGES
-from Obstacles import Obstacle
+from Obstacles import Obstacle, ObstacleIndex
 from Player import Player
 from Settings import *
 from Menu_bar import MenuBar
+from Renderer import DirtyRenderer
+from RenderQueue import *
+from SimClock import SimClock
+from SpatialHash import SpatialHash
+from TileGrid import TileGrid, BLOCKING, BOX, PLAYER, FRUIT
+from ExitMasks import ExitMasks
 from Enemies.EnemyFactory import EnemyFactory
+from Pathfinding.FlowField import FlowField
+from Pathfinding.HierarchicalPathfinder import HierarchicalPathfinder
 
 class Level:
     """
@@ -15,142 +24,348 @@ class Level:
     updating all game objects, handling win/loss conditions, and drawing everything.
     """
 
-    def __init__(self, level_data, lvl_idx):
+    # Subsystems updated by update(), in order; timed separately by a detailed FrameTimer
+    UPDATE_STEPS = ('animation', 'player', 'particles', 'obstacles', 'enemies', 'fruits', 'rules')
+
+    def __init__(self, level_data, lvl_idx, clock=None, save_times=True, seed=None):
+        """
+        Args:
+            level_data (list[str]): Map rows, see Maps.py.
+            lvl_idx (int): Level number, shown in the menu bar and used for best times.
+            clock (SimClock): Simulation clock; a stepped one of TICK_MS by default.
+            save_times (bool): Write best completion times to Assets/best_times.txt.
+            seed (int): Seed of every random choice in the level; a random one by default.
+                Together with the input of every tick it determines the whole run.
+        """
+        # Simulation clock read by every entity, advanced by one fixed step per update
+        self.clock = clock if clock is not None else SimClock(TICK_MS)
+        # Animation timeline of every sprite, advanced once per update from the clock
+        self.timeline = Timeline(self.clock.get_ticks())
+        # Random source of the level and all its entities
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+
         # Sprite groups
         self.obstacles = pygame.sprite.Group()
         self.fruits = pygame.sprite.Group()
         self.all_sprites = pygame.sprite.Group()
         self.enemies = pygame.sprite.Group()
 
+        self.prev_positions = {}  # Sprite -> topleft before the last update, for render interpolation
         self.fruits_to_collect = 0
-        self.grid = np.zeros((13, 19), dtype=int)  # 2D grid to represent tile states
+        self.grid = TileGrid.from_map(level_data, DEBUG_GRID)  # Layered tile states, sized to the map
+        self.obstacle_index = ObstacleIndex(self.obstacles, *self.grid.shape)  # Boxes by tile
+        self.broadphase = SpatialHash()  # Player, enemies and fruits by cell
+        self.pathfinder = self.create_pathfinder()  # Shared path toward the player for all Enemy2
+        self.exit_masks = ExitMasks(self.grid)  # Free exits per tile for random walkers and flyers
+        self.render_queue = RenderQueue()  # Everything drawn, by z-layer
         self.player = None
         self.lvl_idx = lvl_idx
+        self.save_times = save_times
+        self.frame_timer = FrameTimer()  # Disabled; PlayState hands over the game's timer
 
         #Loading the map
         self.load_map(level_data)
+        self.grid.subscribe(self.on_tile_change, BLOCKING)
+        self.grid.subscribe(self.exit_masks.on_tile_change, BLOCKING)
+        self.broadphase.insert(self.player, 'player')
+        for e in self.enemies:
+            self.broadphase.insert(e, 'enemy')
+        for f in self.fruits:
+            self.broadphase.insert(f, 'fruit')
 
         self.all_sprites.add(self.player)
         self.menu_bar = MenuBar(self.lvl_idx)
         self.create_borders()
+
+        # Grass, boxes and borders pre-drawn into the background; boxes still growing are drawn live
+        self.live_obstacles = {}  # Obstacle -> (row, col)
+        self.static_layer = self.bake_static_layer()
+        self.grid.subscribe(self.on_box_change, BOX)
+        self.renderer = DirtyRenderer(self.static_layer, DIRTY_REDRAW_RATIO) if DIRTY_RECTS else None
+        self.frame_blits = 0  # Blits issued by the last draw()
+
+        self.render_queue.attach(LAYER_GROUND, self.ground_items)
+        self.render_queue.attach(LAYER_PARTICLES, self.player.particles.blit_items, self.player.particles.draw)
+        self.render_queue.attach(LAYER_HUD, self.menu_bar.blit_items)
+        self.render_queue.set_cull(LAYER_FRUIT, self.under_box)
+        self.screen_rect = pygame.Rect(0, 0, WIDTH, HEIGHT)
+        self.timeline.set_cull(self.hidden)
         self.running = True
         self.won = False
 
         #Timer
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = self.clock.get_ticks()
         self.time_limit = 60_000
 
     def update(self, keys):
         """
-        Update all game objects for this frame.
+        Update all game objects for this frame, one subsystem after another.
         """
-        self.player.update(keys, self.obstacles, self.grid)
+        now = self.clock.tick()
+        self.prev_positions = {s: s.rect.topleft for s in self.moving_sprites()}
+        split = self.frame_timer.split
+        split()
+        self.update_animations(now)
+        split('animation')
+        self.update_player(keys)
+        split('player')
+        self.update_particles()
+        split('particles')
+        self.update_live_obstacles()
+        split('obstacles')
+        self.update_enemies()
+        split('enemies')
+        self.update_fruits()
+        split('fruits')
+        self.update_rules(now)
+        split('rules')
+
+    def update_animations(self, now):
+        self.timeline.advance(now)
+
+    def update_player(self, keys):
+        self.player.update(keys, self.obstacle_index, self.grid)
+        self.broadphase.update(self.player)
+
+    def update_particles(self):
         self.player.particles.update()
-        self.obstacles.update(keys)
-        self.enemies.update(self.obstacles, self.player)
-        self.fruits.update(self.obstacles)
 
+    def update_enemies(self):
+        self.enemies.update(self.obstacle_index, self.player)
+        self.broadphase.update_all(self.enemies)
+
+    def update_fruits(self):
+        self.fruits.update(self.obstacle_index)
+        self.broadphase.update_all(self.fruits)
+
+    def update_rules(self, now):
+        """
+        Win/loss conditions, the timer and fruit collection.
+        """
         # Check for collisions with enemies or win condition
-        if pygame.sprite.spritecollideany(self.player, self.enemies) or self.fruits_to_collect == 0:
+        if self.broadphase.any(self.player.rect, 'enemy') or self.fruits_to_collect == 0:
             self.running = False
             if self.fruits_to_collect == 0:
                 self.won = True
-                elapsed = pygame.time.get_ticks() - self.start_time
-                self.save_best_time(elapsed)
+                elapsed = now - self.start_time
+                if self.save_times:
+                    self.save_best_time(elapsed)
 
         # Check if the time is up
-        elapsed = pygame.time.get_ticks() - self.start_time
+        elapsed = now - self.start_time
         if elapsed >= self.time_limit:
             self.running = False
             self.won = False
 
         # Update timer
-        remaining_time = max(0, self.time_limit - (pygame.time.get_ticks() - self.start_time)) // 1000
+        remaining_time = max(0, self.time_limit - elapsed) // 1000
         self.menu_bar.update_timer(remaining_time)
 
         # Check for fruit collection
-        collected = pygame.sprite.spritecollide(self.player, self.fruits, dokill=False)
+        collected = self.broadphase.query(self.player.rect, 'fruit')
         for fruit in collected:
             if fruit.collectable: # When pineapple is flying it is temporary not collectable
                 self.fruits_to_collect -= 1
+                self.grid.vacate(*fruit.grid_pos, FRUIT)
+                self.broadphase.remove(fruit)
                 fruit.kill()
 
-    def draw(self, surface):
+        if self.grid.debug:
+            self.grid.verify()
+
+    def moving_sprites(self):
+        """Sprites whose position changes between updates."""
+        return chain((self.player,), self.enemies, self.fruits)
+
+    def render_pos(self, sprite, alpha):
         """
-        Draw the level and all visible elements.
+        Position to draw a sprite at, interpolated between the previous and the
+        current update by alpha (0..1).
         """
-        surface.blit(IMAGES["GRASS"], (0, 0))
-        self.fruits.draw(surface)
-        self.all_sprites.draw(surface)
-        self.obstacles.draw(surface)
-        self.menu_bar.draw(surface)
-        self.player.particles.draw(surface)
+        prev = self.prev_positions.get(sprite)
+        if prev is None or alpha >= 1:
+            return sprite.rect.topleft
+        x, y = sprite.rect.topleft
+        return (round(prev[0] + (x - prev[0]) * alpha),
+                round(prev[1] + (y - prev[1]) * alpha))
+
+    def ground_items(self):
+        return [(self.static_layer, self.static_layer, (0, 0))]
+
+    def under_box(self, fruit):
+        """Fruits covered by a box stay hidden, once the box has finished growing."""
+        if not self.grid.has(*fruit.grid_pos, BOX):
+            return False
+        obs = self.obstacle_index.get(*fruit.grid_pos)
+        return obs is not None and not obs.animating
+
+    def hidden(self, animator):
+        """Timeline cull: sprites off the screen or fruits under a box are not animated."""
+        sprite = animator.owner
+        return not self.screen_rect.colliderect(sprite.rect) or \
+            (sprite in self.fruits and self.under_box(sprite))
+
+    def draw(self, surface, alpha=1.0):
+        """
+        Draw the level and all visible elements.
 
-        for f in self.fruits: # Above obstacles, when flying
-            if isinstance(f, Pineapple):
-                f.draw(surface)
+        Args:
+            alpha (float): Fraction of a tick since the last update, used to interpolate moving sprites.
+
+        Returns:
+            list[pygame.Rect] | None: Changed screen areas in dirty-rect mode, None if the whole surface was redrawn.
+        """
+        position = lambda sprite: self.render_pos(sprite, alpha)
+        if self.renderer is not None:
+            # The renderer restores the ground layer itself, from the static layer
+            items = self.render_queue.items(position, skip=(LAYER_GROUND,))
+            rects = self.renderer.render(surface, items)
+            self.frame_blits = self.renderer.blits
+            return rects
+        self.frame_blits = self.render_queue.draw(surface, position)
+        return None
 
     def load_map(self, level_data):
         """
         Load the level layout and populate the grid and sprite groups.
         """
-        if not pygame.mixer.music.get_busy(): # Start music
-            start_music()
+        start_music() # Keeps playing if it already does
 
+        start = None
         for row_idx, row in enumerate(level_data):
             for col_idx, tile_char in enumerate(row):
                 x = col_idx * TILE_SIZE + MAP_OFFSET
                 y = row_idx * TILE_SIZE + MAP_OFFSET
 
                 if tile_char == '#':
-                    ob = f"BOX{random.randint(0, 2)}"
+                    ob = f"BOX{self.rng.randint(0, 2)}"
                     tile = Obstacle(x, y, ob, True)
-                    self.obstacles.add(tile)
+                    self.obstacle_index.add(row_idx, col_idx, tile)
                     self.all_sprites.add(tile)
-                    self.grid[row_idx][col_idx] = 1
+                    self.grid.set(row_idx, col_idx, BOX)
 
                 elif tile_char == 'P':
-                    self.player = Player(x, y)
-                    self.grid[row_idx][col_idx] = 3
+                    start = (x, y, row_idx, col_idx)  # A map with several 'P' starts at the last one
 
                 elif tile_char == 'a':
-                    e = EnemyFactory.create(1, x, y, self.grid)
+                    e = EnemyFactory.create(1, x, y, self.grid, self.timeline, exit_masks=self.exit_masks, rng=self.rng)
                     self.enemies.add(e)
                     self.all_sprites.add(e)
-                    self.grid[row_idx][col_idx] = 2
+                    self.render_queue.add(e, LAYER_ACTORS)
 
                 elif tile_char == 'b':
-                    e = EnemyFactory.create(2, x, y, self.grid)
+                    e = EnemyFactory.create(2, x, y, self.grid, self.timeline, self.pathfinder)
                     self.enemies.add(e)
                     self.all_sprites.add(e)
-                    self.grid[row_idx][col_idx] = 2
+                    self.render_queue.add(e, LAYER_ACTORS)
 
                 elif tile_char == 'A':
                     tile = FruitFactory.create('orange', x, y)
                     self.fruits.add(tile)
+                    self.render_queue.add(tile, LAYER_FRUIT)
                     self.fruits_to_collect += 1
+                    self.grid.occupy(row_idx, col_idx, FRUIT)
 
                 elif tile_char == 'B':
-                    tile = FruitFactory.create('strawberry', x, y)
+                    tile = FruitFactory.create('strawberry', x, y, grid=self.grid, timeline=self.timeline, exit_masks=self.exit_masks, rng=self.rng)
                     self.fruits.add(tile)
+                    self.render_queue.add(tile, LAYER_FRUIT)
                     self.fruits_to_collect += 1
+                    self.grid.occupy(row_idx, col_idx, FRUIT)
 
                 elif tile_char == 'C':
-                    tile = FruitFactory.create('pineapple', x, y, grid=self.grid)
+                    tile = FruitFactory.create('pineapple', x, y, grid=self.grid, timeline=self.timeline, exit_masks=self.exit_masks, rng=self.rng)
                     self.fruits.add(tile)
+                    self.render_queue.add(tile, LAYER_FLYING) # Above obstacles, when flying
                     self.fruits_to_collect += 1
+                    self.grid.occupy(row_idx, col_idx, FRUIT)
+
+        if start is None:
+            raise ValueError(f"Level {self.lvl_idx} has no player start ('P')")
+        x, y, row_idx, col_idx = start
+        self.player = Player(x, y, self.clock, self.timeline, self.broadphase, self.rng)
+        self.render_queue.add(self.player, LAYER_ACTORS)
+        self.grid.occupy(row_idx, col_idx, PLAYER)
 
-                else:
-                    self.grid[row_idx][col_idx] = 0
+        self.exit_masks.rebuild()
+
+    def create_pathfinder(self):
+        """
+        Flow field for regular maps, cluster-based pathfinding for very large ones.
+        Both build lazily on the first query, after the map is loaded.
+        """
+        rows, cols = self.grid.shape
+        if rows * cols >= HPA_MIN_TILES:
+            return HierarchicalPathfinder(self.grid, HPA_CLUSTER_SIZE)
+        return FlowField(self.grid)
+
+    def on_tile_change(self, row, col, old, new):
+        """
+        Grid subscriber: a wall was created or destroyed at (row, col).
+        """
+        self.pathfinder.invalidate(row, col)
+
+    def update_live_obstacles(self):
+        """
+        Animate the boxes that are still growing and bake each one into the
+        static layer once its animation has finished.
+        """
+        for obs, (row, col) in list(self.live_obstacles.items()):
+            obs.update()
+            if not obs.alive() or not obs.animating:
+                del self.live_obstacles[obs]
+                if obs.alive():
+                    self.render_queue.remove(obs)
+                    self.bake_tile(row, col)
+
+    def bake_static_layer(self):
+        """
+        Draw grass, every finished box and the borders into one surface.
+        """
+        layer = IMAGES["GRASS"].copy()
+        layer.blits([(o.image, o.rect) for o in self.obstacles if not o.animating], False)
+        layer.blits([(b.image, b.rect) for b in self.borders], False)
+        return layer
+
+    def bake_tile(self, row, col):
+        """
+        Redraw a single tile of the static layer from the grass and the box on it.
+        """
+        rect = pygame.Rect(col * TILE_SIZE + MAP_OFFSET, row * TILE_SIZE + MAP_OFFSET, TILE_SIZE, TILE_SIZE)
+        layer = self.static_layer
+        layer.set_clip(rect)
+        layer.blit(IMAGES["GRASS"], rect, rect)
+        obs = self.obstacle_index.get(row, col)
+        if obs is not None:
+            layer.blit(obs.image, obs.rect)
+        layer.blits([(b.image, b.rect) for b in self.borders], False)
+        layer.set_clip(None)
+        if self.renderer is not None:
+            self.renderer.mark_dirty(rect)
+
+    def on_box_change(self, row, col, old, new):
+        """
+        Grid subscriber: a box was created or destroyed at (row, col).
+        A new box is baked only after it has finished growing.
+        """
+        obs = self.obstacle_index.get(row, col)
+        if obs is not None and obs.animating:
+            self.live_obstacles[obs] = (row, col)
+            self.render_queue.add(obs, LAYER_OBSTACLES)
+        else:
+            self.bake_tile(row, col)
 
     def create_borders(self):
         """
         Adds decorative screen border elements.
         """
-        self.obstacles.add(Obstacle(0, 0, "BORDER_P"))
-        self.obstacles.add(Obstacle(WIDTH-25, 0, "BORDER_P"))
-        self.obstacles.add(Obstacle(25, 0, "BORDER_D"))
-        self.obstacles.add(Obstacle(25, HEIGHT-75, "BORDER_DL"))
+        self.borders = [
+            Obstacle(0, 0, "BORDER_P"),
+            Obstacle(WIDTH-25, 0, "BORDER_P"),
+            Obstacle(25, 0, "BORDER_D"),
+            Obstacle(25, HEIGHT-75, "BORDER_DL"),
+        ]
 
     def save_best_time(self, elapsed_ms):
         """
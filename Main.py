@@ -1,6 +1,48 @@
-from Game import Game
+import time
+START = time.perf_counter()
+import argparse
+import pygame
+PYGAME_IMPORTED = time.perf_counter()
+from Game import Game, StartupTrace
+from FrameTimer import FrameTimer
+from Profiler import ProfileCapture, MODES as PROFILE_MODES, PROFILE_DIR
+from MemoryTracker import AllocationTracker
+from Replay import InputRecorder, REPLAY_DIR
+from Level import Level
+GAME_IMPORTED = time.perf_counter()
 
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Forest - a Pygame maze game.")
+    parser.add_argument("--startup-trace", action="store_true",
+                        help="print import, asset load and first-frame timings once startup is done")
+    parser.add_argument("--frame-timing", action="store_true",
+                        help="record per-phase frame timings from the start (F3 shows them, F4 exports them)")
+    parser.add_argument("--frame-timing-detail", action="store_true",
+                        help="also time each subsystem of the level update")
+    parser.add_argument("--frame-csv", metavar="PATH", help="export the frame timings to PATH on exit")
+    parser.add_argument("--profile", choices=PROFILE_MODES,
+                        help="profile from the start (F5 stops and starts captures, sampling by default)")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, help="where profile captures are written")
+    parser.add_argument("--memory", action="store_true",
+                        help="trace allocations and report memory, live objects and gc statistics "
+                             "whenever a level is entered or exited")
+    parser.add_argument("--record", action="store_true",
+                        help="record the seed and input of every level played, for Benchmarks.ReplayRunner")
+    parser.add_argument("--replay-dir", default=REPLAY_DIR, help="where recordings are written")
+    args = parser.parse_args()
+
+    trace = StartupTrace(args.startup_trace, origin=START)
+    trace.span("import pygame", START, PYGAME_IMPORTED)
+    trace.span("import game modules", PYGAME_IMPORTED, GAME_IMPORTED)
+    frame_timer = FrameTimer(details=Level.UPDATE_STEPS if args.frame_timing_detail else ())
+    frame_timer.enable(args.frame_timing or args.frame_timing_detail or args.frame_csv is not None)
+    profiler = ProfileCapture(args.profile or 'sample', args.profile_dir)
+    memory = AllocationTracker()
+    if args.memory:
+        memory.enable()
+    recorder = InputRecorder(args.replay_dir, args.record)
+    game = Game(trace, frame_timer, args.frame_csv, profiler, memory, recorder)
+    if args.profile:
+        profiler.start()
+    game.run()
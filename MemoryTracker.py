@@ -0,0 +1,207 @@
+import gc
+import time
+import tracemalloc
+import weakref
+from itertools import chain
+import pygame
+from Animation import Animator
+from Enemies.Enemy1 import Enemy1
+from Enemies.Enemy2 import Enemy2
+from Fruits.Orange import Orange
+from Fruits.Pineapple import Pineapple
+from Fruits.Strawberry import Strawberry
+from Level import Level
+from Obstacles import Obstacle
+from ParticleSystem import ParticleSystem
+from Player import Player
+
+TOP_SITES = 10    # Allocation sites listed when a level is exited
+TRACE_DEPTH = 1   # Frames stored per allocation by tracemalloc
+
+# Classes whose live instances are counted. Surfaces and sounds are not tracked
+# by gc; they are counted through the objects referring to them.
+COUNTED = (Level, Player, Obstacle, Enemy1, Enemy2, Orange, Strawberry, Pineapple,
+           ParticleSystem, Animator, pygame.Surface, pygame.mixer.Sound)
+
+# Allocations of the tracking itself are left out of snapshots
+FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def live_counts(classes=COUNTED):
+    """Number of live instances of each class (exact type), by class name."""
+    names = {cls: cls.__name__ for cls in classes}
+    counts = dict.fromkeys(names.values(), 0)
+    objects = gc.get_objects()
+    seen = set()
+    for obj in chain(objects, gc.get_referents(*objects)):
+        name = names.get(type(obj))
+        if name is not None and id(obj) not in seen:
+            seen.add(id(obj))
+            counts[name] += 1
+    return counts
+
+
+def format_counts(counts):
+    return ", ".join(f"{name} {n}" for name, n in counts.items() if n) or "none"
+
+
+def format_site(stat):
+    frame = stat.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+class AllocationTracker:
+    """
+    Opt-in memory tracking of levels, built on tracemalloc and gc statistics.
+
+    Whenever a level is entered or exited, garbage is collected and memory is
+    measured: the traced bytes, the live instances of the COUNTED classes and a
+    snapshot of the allocations by source line. Entering a level reports the
+    change since the same level was last entered, so memory a restart does not
+    reclaim shows up as growth. Exiting reports the memory allocated per frame,
+    the sites that grew most per frame while the level was played, and the
+    garbage collections that ran.
+    While disabled every call returns at once.
+    """
+
+    def __init__(self, top=TOP_SITES, depth=TRACE_DEPTH, log=print):
+        """
+        Args:
+            top (int): Allocation sites reported when a level is exited.
+            depth (int): Frames stored per allocation, if tracing is started here.
+            log (callable): Receives every report line.
+        """
+        self.top = top
+        self.depth = depth
+        self.log = log
+        self.enabled = False
+        self.started_tracing = False
+        self.level = None         # Weak reference to the level being played
+        self.level_number = None
+        self.entered = None       # measure() when the level was entered
+        self.entries = {}         # Level number -> (times entered, traced bytes when last entered)
+        self.frames = 0           # Frames since the level was entered
+        self.frame_bytes = 0      # Allocated by those frames, also if freed again
+        self.frame_max = 0        # Most allocated by one frame
+        self.frame_start = 0      # Traced bytes when the current frame started
+        self.collecting = False   # Our own collections are left out of the gc statistics
+        self.gc_start = 0.0
+        self.gc_stats = self.new_gc_stats()
+
+    @staticmethod
+    def new_gc_stats():
+        return {"collections": [0, 0, 0], "collected": 0, "uncollectable": 0,
+                "pause_ms": 0.0, "max_pause_ms": 0.0}
+
+    def enable(self):
+        """Start tracing allocations (if not already traced) and recording gc statistics."""
+        if self.enabled:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.depth)
+            self.started_tracing = True
+        gc.callbacks.append(self.on_gc)
+        self.enabled = True
+
+    def disable(self):
+        """Report on the level being played, if any, and stop tracking."""
+        if not self.enabled:
+            return
+        self.exit_level()
+        gc.callbacks.remove(self.on_gc)
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+        self.enabled = False
+
+    def on_gc(self, phase, info):
+        if self.collecting:
+            return
+        if phase == "start":
+            self.gc_start = time.perf_counter()
+            return
+        pause = (time.perf_counter() - self.gc_start) * 1000
+        stats = self.gc_stats
+        stats["collections"][info["generation"]] += 1
+        stats["collected"] += info["collected"]
+        stats["uncollectable"] += info["uncollectable"]
+        stats["pause_ms"] += pause
+        stats["max_pause_ms"] = max(stats["max_pause_ms"], pause)
+
+    def measure(self):
+        """
+        Collect garbage, then measure memory.
+
+        Returns:
+            dict: "traced" bytes (outside the tracking itself), live "counts" by
+                class name and the filtered tracemalloc "snapshot".
+        """
+        self.collecting = True
+        try:
+            gc.collect()
+        finally:
+            self.collecting = False
+        snapshot = tracemalloc.take_snapshot().filter_traces(FILTERS)
+        traced = sum(stat.size for stat in snapshot.statistics("filename"))
+        return {"traced": traced, "counts": live_counts(), "snapshot": snapshot}
+
+    def enter_level(self, level, number):
+        """Start tracking level (a no-op if it is tracked already), exiting the previous one."""
+        if not self.enabled or (self.level is not None and self.level() is level):
+            return
+        self.exit_level()
+        state = self.measure()
+        times, previous = self.entries.get(number, (0, None))
+        self.entries[number] = (times + 1, state["traced"])
+        change = "" if previous is None else f", {(state['traced'] - previous) / 1024:+.1f} KB since last entered"
+        self.log(f"memory: level {number} entered (#{times + 1}): "
+                 f"{state['traced'] / 1024:.1f} KB traced{change}")
+        self.log(f"  live: {format_counts(state['counts'])}")
+
+        self.level = weakref.ref(level)
+        self.level_number = number
+        self.entered = state
+        self.frames = self.frame_bytes = self.frame_max = 0
+        self.gc_stats = self.new_gc_stats()
+        tracemalloc.reset_peak()
+        self.frame_start = tracemalloc.get_traced_memory()[0]
+
+    def end_frame(self):
+        """Count what the frame allocated, also if it was freed again. Call once per frame."""
+        if self.level is None:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        allocated = peak - self.frame_start
+        self.frames += 1
+        self.frame_bytes += allocated
+        self.frame_max = max(self.frame_max, allocated)
+        tracemalloc.reset_peak()
+        self.frame_start = current
+
+    def exit_level(self):
+        """Report on the level being played, while it is still alive, and stop tracking it."""
+        if self.level is None:
+            return
+        state = self.measure()
+        frames = max(self.frames, 1)
+        retained = state["traced"] - self.entered["traced"]
+        self.log(f"memory: level {self.level_number} exited after {self.frames} frames: "
+                 f"{self.frame_bytes / frames / 1024:.1f} KB allocated per frame "
+                 f"(max {self.frame_max / 1024:.1f} KB), {retained / 1024:+.1f} KB since entered")
+        gc_stats = self.gc_stats
+        self.log(f"  gc: {'/'.join(map(str, gc_stats['collections']))} collections (gen 0/1/2), "
+                 f"{gc_stats['collected']} collected, {gc_stats['uncollectable']} uncollectable, "
+                 f"{gc_stats['pause_ms']:.1f} ms paused (max {gc_stats['max_pause_ms']:.2f} ms)")
+        grown = [s for s in state["snapshot"].compare_to(self.entered["snapshot"], "lineno") if s.size_diff > 0]
+        grown.sort(key=lambda s: s.size_diff, reverse=True)
+        for stat in grown[:self.top]:
+            self.log(f"  {stat.size_diff / frames:+10.1f} B/frame {stat.count_diff:+7d} blocks  {format_site(stat)}")
+        self.log(f"  live: {format_counts(state['counts'])}")
+        self.level = None
+        self.entered = None
@@ -1,27 +1,35 @@
 from Settings import *
+import TextCache
 
 class MenuBar:
     def __init__(self, level):
         self.level = level
         self.time_left = 60  # seconds
+        self.font_color = (29, 78, 28)
+
+        # Rendered strings, refreshed only when the displayed value changes
+        self.level_surf = None
+        self.time_surf = None
+        self.shown_time = None
 
     def update_timer(self, time_left):
         """Update the time left to be displayed."""
         self.time_left = time_left
 
-    def draw(self, screen):
-        font = pygame.font.Font("Assets/Adumu.ttf", 40)
-        font_color = (29, 78, 28)
-
+    def blit_items(self):
+        """(key, image, pos) of the rendered labels, as used by DirtyRenderer."""
         # LEVEL info
-        level_text = f"LEVEL {self.level}"
-        level_surf = font.render(level_text, True, font_color)
-        screen.blit(level_surf, (320, HEIGHT - 50))
+        if self.level_surf is None:
+            self.level_surf = TextCache.render(f"LEVEL {self.level}", 40, self.font_color)
 
         # TIME info
-        minutes = self.time_left // 60
-        seconds = self.time_left % 60
-        time_str = f"{minutes:02}:{seconds:02}"
-        time_surf = font.render(time_str, True, font_color)
-        screen.blit(time_surf, (560, HEIGHT - 50))
+        if self.time_left != self.shown_time:
+            minutes = self.time_left // 60
+            seconds = self.time_left % 60
+            self.time_surf = TextCache.render(f"{minutes:02}:{seconds:02}", 40, self.font_color)
+            self.shown_time = self.time_left
+        return [((self, 'level'), self.level_surf, (320, HEIGHT - 50)),
+                ((self, 'time'), self.time_surf, (560, HEIGHT - 50))]
 
+    def draw(self, screen):
+        screen.blits([(image, pos) for _, image, pos in self.blit_items()], False)
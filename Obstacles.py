@@ -1,56 +1,98 @@
-from Images import IMAGES
+from Images import IMAGES, get_variant, growth_frames
 from Settings import *
+from Animation import Animator, Clip, ONCE
+
+GROWTH_STEPS = 10
 
 class Obstacle(pygame.sprite.Sprite):
     """
     Represents an obstacle on the map.
     """
 
-    def __init__(self, x, y, png, destructable=False, growing=False):
+    def __init__(self, x, y, png, destructable=False, growing=False, timeline=None):
         super().__init__()
+        self.key = png
         self.base_image = IMAGES[png]
         self.destructable = destructable
         self.growing = growing # Only obstacles created by player have growing animation
+        self.animator = None # Plays the growth animation, None when not animating
 
         if png.upper().startswith('BOX') and self.growing:
-            # Initialize growing animation frames by scaling the image step-by-step
-            self.frames = []
-            steps = 10
-            for i in range(1, steps + 1):
-                scale = i / steps
-                size = (int(TILE_SIZE * scale), int(TILE_SIZE * scale))
-                scaled_img = pygame.transform.scale(self.base_image, size)
-                self.frames.append(scaled_img)
-            self.frame_index = 0
-            self.image = self.frames[0]
+            # Growth frames are scaled once per image and shared by all boxes
+            self.growth_delay = 50
+            self.animator = Animator(timeline, Clip(self.growth_frames(), self.growth_delay, ONCE), self)
+            self.animator.play(self.animator.clip)
+            self.image = self.animator.frame
 
             # Center the growing animation around the middle of the tile
             cx, cy = x + TILE_SIZE // 2, y + TILE_SIZE // 2
             self.rect = self.image.get_rect(center=(cx, cy))
-            self.growth_delay = 50
-            self.last_time = pygame.time.get_ticks()
 
         else:
             self.image = self.base_image
             self.rect = self.image.get_rect(topleft=(x, y))
 
+    @property
+    def animating(self):
+        """True while the growing animation is still playing."""
+        return self.animator is not None
+
+    def growth_frames(self):
+        return get_variant(self.key, growth_frames, GROWTH_STEPS, TILE_SIZE)
+
     def update(self, *args):
         """
-        Updates the obstacle's animation if it's a growing object.
+        Shows the current growth frame, or the final image once the animation has finished.
         """
-        if hasattr(self, 'frames'):
-            now = pygame.time.get_ticks()
-            if now - self.last_time >= self.growth_delay:
-                self.last_time = now
-                self.frame_index += 1
-
-                if self.frame_index < len(self.frames):
-                    old_center = self.rect.center
-                    self.image = self.frames[self.frame_index]
-                    self.rect = self.image.get_rect(center=old_center)
-                else:
-                    # Animation finished, switch to final image and stop updating
-                    old_center = self.rect.center
-                    self.image = self.base_image
-                    self.rect = self.image.get_rect(center=old_center)
-                    del self.frames
+        if self.animator is not None:
+            old_center = self.rect.center
+            if self.animator.done:
+                # Animation finished, switch to final image and stop updating
+                self.image = self.base_image
+                self.animator = None
+            else:
+                self.image = self.animator.frame
+            self.rect = self.image.get_rect(center=old_center)
+
+
+class ObstacleIndex:
+    """
+    Tile -> obstacle sprite lookup for the boxes on the map, kept in sync with
+    Level.grid. Screen borders are not indexed: anything outside the map is
+    treated as blocked by a fixed bounds check instead.
+    """
+
+    def __init__(self, group, rows, cols):
+        """
+        Args:
+            group (pygame.sprite.Group): Group that indexed obstacles are also added to.
+            rows (int): Map height in tiles.
+            cols (int): Map width in tiles.
+        """
+        self.group = group
+        self.rows = rows
+        self.cols = cols
+        self.tiles = {}
+
+    def in_bounds(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def get(self, row, col):
+        """Return the obstacle at (row, col), or None."""
+        return self.tiles.get((row, col))
+
+    def blocked(self, row, col):
+        """True if the tile holds an obstacle or lies outside the map."""
+        return (row, col) in self.tiles or not self.in_bounds(row, col)
+
+    def add(self, row, col, obstacle):
+        """Place an obstacle on (row, col). Growing boxes are indexed from the moment they appear."""
+        self.tiles[(row, col)] = obstacle
+        self.group.add(obstacle)
+
+    def remove(self, row, col):
+        """Remove and kill the obstacle at (row, col). Returns it, or None if the tile was empty."""
+        obstacle = self.tiles.pop((row, col), None)
+        if obstacle is not None:
+            obstacle.kill()
+        return obstacle
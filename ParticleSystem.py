@@ -0,0 +1,121 @@
+import math
+from itertools import repeat
+import pygame
+
+PARTICLE_CAPACITY = 10_000
+GRAVITY = 0.2            # Added to the vertical velocity every update
+SIZES = range(4, 9)      # Square particle sizes in pixels
+TINTS = 8                # Shades of green between GREEN_RANGE[0] and GREEN_RANGE[1]
+GREEN_RANGE = (100, 160)
+ALPHA_LEVELS = 16        # Fade steps from opaque to invisible
+
+_sprites = []            # Built by the first ParticleSystem and shared by all
+
+
+class ParticleSystem:
+    """
+    Fading, falling green particles (box debris) stored in preallocated arrays.
+
+    Position, velocity, life and look of every particle live in NumPy arrays of a
+    fixed capacity and are advanced together by update(). Dead slots are reused
+    by emit(); when every slot is in use, new particles are dropped. Only the
+    slots below `hi` can be alive, so the arrays are processed up to there and
+    not at all while no particle is alive. Particles are drawn with small
+    sprites pre-built once for every size, tint and fade level.
+    """
+
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None):
+        import numpy as np  # Imported on first use, not at startup
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)   # Centre
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int16)         # Updates left, 0 = free slot
+        self.max_life = np.ones(capacity, dtype=np.int16)
+        self.look = np.zeros(capacity, dtype=np.int16)         # size index * TINTS + tint
+        self.half = np.zeros(capacity, dtype=np.float32)       # Half of the size, to draw around pos
+        self.hi = 0  # Every slot from here on is free
+        if not _sprites:
+            _sprites.extend(self.build_sprites())
+        self.sprites = _sprites
+
+    @staticmethod
+    def build_sprites():
+        """Sprite for every (size, tint, fade level), indexed by look * ALPHA_LEVELS + level."""
+        sprites = []
+        for size in SIZES:
+            for tint in range(TINTS):
+                green = GREEN_RANGE[0] + (GREEN_RANGE[1] - GREEN_RANGE[0]) * tint // (TINTS - 1)
+                for level in range(ALPHA_LEVELS):
+                    image = pygame.Surface((size, size))
+                    image.fill((0, green, 0))
+                    image.set_alpha(255 * level // (ALPHA_LEVELS - 1))
+                    sprites.append(image)
+        return sprites
+
+    def __len__(self):
+        import numpy as np
+        return int(np.count_nonzero(self.life[:self.hi]))
+
+    def emit(self, center, count=20):
+        """Spawn up to count particles flying out of center in random directions."""
+        import numpy as np
+        # Lowest free slots first: the free ones below hi, then the ones after it
+        hi = self.hi
+        slots = np.flatnonzero(self.life[:hi] == 0)[:count]
+        if len(slots) < count:
+            slots = np.concatenate((slots, np.arange(hi, min(self.capacity, hi + count - len(slots)))))
+        n = len(slots)
+        if not n:
+            return
+        self.hi = max(hi, int(slots[-1]) + 1)
+        rng = self.rng
+        angle = rng.uniform(0, 2 * math.pi, n)
+        speed = rng.uniform(1, 4, n)
+        self.pos[slots] = center
+        self.vel[slots, 0] = speed * np.cos(angle)
+        self.vel[slots, 1] = speed * np.sin(angle)
+        life = rng.integers(20, 41, n)
+        self.life[slots] = life
+        self.max_life[slots] = life
+        size_idx = rng.integers(0, len(SIZES), n)
+        self.look[slots] = size_idx * TINTS + rng.integers(0, TINTS, n)
+        self.half[slots] = (size_idx + SIZES[0]) / 2
+
+    def update(self):
+        """Move, pull down and age every live particle by one step."""
+        hi = self.hi
+        if not hi:
+            return
+        import numpy as np
+        pos, vel, life = self.pos[:hi], self.vel[:hi], self.life[:hi]
+        alive = life > 0
+        np.add(pos, vel, out=pos, where=alive[:, None])
+        np.add(vel[:, 1], GRAVITY, out=vel[:, 1], where=alive)
+        np.subtract(life, 1, out=life, where=alive)
+        live = np.flatnonzero(life)
+        self.hi = int(live[-1]) + 1 if len(live) else 0
+
+    def _visible(self):
+        """Slots, sprites and top-left positions of the live particles."""
+        if not self.hi:
+            return [], [], ()
+        import numpy as np
+        live = np.flatnonzero(self.life[:self.hi])
+        life = self.life[live].astype(np.int32)
+        max_life = self.max_life[live]
+        level = (life * (ALPHA_LEVELS - 1) + max_life - 1) // max_life
+        codes = (self.look[live] * ALPHA_LEVELS + level).tolist()
+        xs, ys = (self.pos[live] - self.half[live, None]).astype(np.int32).T.tolist()
+        return live.tolist(), list(map(self.sprites.__getitem__, codes)), zip(xs, ys)
+
+    def blit_items(self):
+        """(key, image, pos) of every visible particle, as used by RenderQueue."""
+        slots, images, positions = self._visible()
+        return list(zip(zip(repeat(self), slots), images, positions))
+
+    def draw(self, surface):
+        """Draw all particles with a single Surface.blits() call; returns the number drawn."""
+        _, images, positions = self._visible()
+        surface.blits(zip(images, positions), False)
+        return len(images)
@@ -0,0 +1,83 @@
+from Pathfinding.GridSearch import NEIGHBOURS
+from TileGrid import BLOCKING
+
+class FlowField:
+    """
+    Level-wide BFS distance field toward a single goal tile (the player).
+
+    The field is built once with a vectorized wavefront over the grid and shared
+    by every Enemy2, which reads its next step in O(1). It is rebuilt lazily only
+    when the goal tile changes or after invalidate() is called for a grid change.
+    """
+
+    UNREACHABLE = -1
+
+    def __init__(self, grid):
+        """
+        Args:
+            grid (TileGrid): Level grid, BLOCKING tiles are walls.
+        """
+        import numpy as np  # Imported on first use, not at startup
+        self.grid = grid
+        self.goal = None
+        self.dist = np.full(grid.shape, self.UNREACHABLE, dtype=np.int32)
+        self.valid = False
+        self.builds = 0
+
+        # Reusable wavefront buffers
+        self._frontier = np.zeros(grid.shape, dtype=bool)
+        self._next = np.zeros(grid.shape, dtype=bool)
+        self._reached = np.zeros(grid.shape, dtype=bool)
+
+    def invalidate(self, *args):
+        """Mark the field stale, e.g. after an obstacle was created or destroyed."""
+        self.valid = False
+
+    def build(self, goal):
+        """Compute the distance of every tile to goal with a NumPy wavefront."""
+        self.goal = goal
+        self.valid = True
+        self.builds += 1
+
+        passable = (self.grid.view() & BLOCKING) == 0
+        passable[goal] = True  # The goal is always reachable, as in Enemy2.bfs
+        dist = self.dist
+        dist.fill(self.UNREACHABLE)
+        frontier, nxt, reached = self._frontier, self._next, self._reached
+        frontier.fill(False)
+        frontier[goal] = True
+        reached[...] = frontier
+        dist[goal] = 0
+
+        d = 0
+        while frontier.any():
+            d += 1
+            nxt.fill(False)
+            nxt[1:, :] |= frontier[:-1, :]
+            nxt[:-1, :] |= frontier[1:, :]
+            nxt[:, 1:] |= frontier[:, :-1]
+            nxt[:, :-1] |= frontier[:, 1:]
+            nxt &= passable
+            nxt &= ~reached
+            dist[nxt] = d
+            reached |= nxt
+            frontier, nxt = nxt, frontier
+        self._frontier, self._next = frontier, nxt
+
+    def next_step(self, start, goal):
+        """
+        Return the tile to move to from start on a shortest path to goal,
+        or None when goal is unreachable or already reached.
+        """
+        if not self.valid or goal != self.goal:
+            self.build(goal)
+
+        d = self.dist[start]
+        if d <= 0:
+            return None
+        rows, cols = self.dist.shape
+        for dr, dc in NEIGHBOURS:
+            r, c = start[0] + dr, start[1] + dc
+            if 0 <= r < rows and 0 <= c < cols and self.dist[r, c] == d - 1:
+                return (r, c)
+        return None
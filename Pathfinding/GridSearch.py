@@ -0,0 +1,39 @@
+from collections import deque
+from TileGrid import BLOCKING
+
+NEIGHBOURS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+def bfs_path(grid, start, goal):
+    """
+    Compute the shortest path from start to goal on a TileGrid using BFS.
+    BLOCKING tiles are walls; the goal itself is always enterable.
+
+    Returns:
+        list[tuple]: Tiles from start to goal (inclusive), or [] when unreachable.
+    """
+    rows, cols = grid.shape
+    cells = grid.cells
+    queue = deque([start])
+    came_from = {start: None}
+    visited = {start}
+
+    while queue:
+        cur = queue.popleft()
+        if cur == goal:
+            path = []
+            while cur is not None:
+                path.append(cur)
+                cur = came_from[cur]
+            return path[::-1]
+        # For every neighbour
+        for dr, dc in NEIGHBOURS:
+            r, c = cur[0] + dr, cur[1] + dc
+            nb = (r, c)
+            # If the neighbour is available and not in visited, it's added to the queue
+            if (0 <= r < rows and 0 <= c < cols
+                and (not cells[r * cols + c] & BLOCKING or nb == goal)
+                and nb not in visited):
+                visited.add(nb)
+                came_from[nb] = cur
+                queue.append(nb)
+    return []
@@ -0,0 +1,280 @@
+import heapq
+from collections import deque
+from Pathfinding.GridSearch import NEIGHBOURS
+from TileGrid import BLOCKING
+
+class HierarchicalPathfinder:
+    """
+    HPA*-style pathfinder for large grids.
+
+    The grid is split into square clusters. Walkable runs along every border
+    between two clusters get one or two transitions (entrance tile pairs), and
+    the BFS distances between the entrances of each cluster are precomputed.
+    A query connects start and goal to the entrances of their clusters, runs A*
+    over the small abstract graph and refines only the first segment of the
+    result into tile steps.
+
+    The graph is built lazily on the first query. When a tile toggles afterwards,
+    only its cluster (and the borders it shares with its neighbours) is rebuilt.
+    """
+
+    LONG_ENTRANCE = 6  # Walkable runs at least this long get a transition at each end
+
+    def __init__(self, grid, cluster_size=10):
+        """
+        Args:
+            grid (TileGrid): Level grid, BLOCKING tiles are walls.
+            cluster_size (int): Cluster edge length in tiles.
+        """
+        self.grid = grid
+        self.rows, self.cols = grid.shape
+        self.k = cluster_size
+        self.cluster_rows = -(-self.rows // self.k)
+        self.cluster_cols = -(-self.cols // self.k)
+
+        self.walkable = {}      # cluster -> 2D list of bools for the tiles of that cluster
+        self.transitions = {}   # (cluster, neighbour cluster) -> [(tile, tile across border)]
+        self.inter = {}         # tile -> set of entrance tiles across a border
+        self.nodes = {}         # cluster -> set of entrance tiles inside it
+        self.intra = {}         # cluster -> {entrance: {entrance: distance}}
+
+        self.goal = None
+        self._steps = {}        # start -> next step, for the current goal and grid
+        self.built = False
+        self.rebuilds = 0
+
+    # ------------------------------------------------------------------ layout
+
+    def cluster_of(self, tile):
+        return (tile[0] // self.k, tile[1] // self.k)
+
+    def bounds(self, cluster):
+        """Return (r0, r1, c0, c1), the half-open tile range covered by a cluster."""
+        r0, c0 = cluster[0] * self.k, cluster[1] * self.k
+        return r0, min(r0 + self.k, self.rows), c0, min(c0 + self.k, self.cols)
+
+    def neighbour_clusters(self, cluster):
+        cr, cc = cluster
+        for dr, dc in NEIGHBOURS:
+            nr, nc = cr + dr, cc + dc
+            if 0 <= nr < self.cluster_rows and 0 <= nc < self.cluster_cols:
+                yield (nr, nc)
+
+    def is_walkable(self, tile):
+        cluster = self.cluster_of(tile)
+        r0, _, c0, _ = self.bounds(cluster)
+        return self.walkable[cluster][tile[0] - r0][tile[1] - c0]
+
+    # ---------------------------------------------------------------- building
+
+    def build(self):
+        """Build the whole abstract graph from scratch."""
+        clusters = [(cr, cc) for cr in range(self.cluster_rows) for cc in range(self.cluster_cols)]
+        for cluster in clusters:
+            self._read_cluster(cluster)
+        for cluster in clusters:
+            for other in ((cluster[0], cluster[1] + 1), (cluster[0] + 1, cluster[1])):
+                if other[0] < self.cluster_rows and other[1] < self.cluster_cols:
+                    self._build_border(cluster, other)
+        for cluster in clusters:
+            self._build_intra(cluster)
+        self._steps.clear()
+        self.built = True
+
+    def rebuild_cluster(self, cluster):
+        """Re-read one cluster and rebuild its borders and entrance distances."""
+        self.rebuilds += 1
+        self._read_cluster(cluster)
+        changed = [cluster]
+        for other in self.neighbour_clusters(cluster):
+            if self._build_border(cluster, other):
+                changed.append(other)
+        for c in changed:
+            self._build_intra(c)
+        self._steps.clear()
+
+    def invalidate(self, row, col):
+        """Called after the tile at (row, col) was toggled between wall and floor."""
+        if self.built:
+            self.rebuild_cluster(self.cluster_of((row, col)))
+
+    def _read_cluster(self, cluster):
+        r0, r1, c0, c1 = self.bounds(cluster)
+        self.walkable[cluster] = ((self.grid.view()[r0:r1, c0:c1] & BLOCKING) == 0).tolist()
+
+    def _build_border(self, a, b):
+        """
+        (Re)compute the transitions on the border between clusters a and b.
+        Returns True if they changed.
+        """
+        key = (a, b) if a < b else (b, a)
+        a, b = key
+        ar0, ar1, ac0, ac1 = self.bounds(a)
+        if a[0] == b[0]:
+            # b is to the right of a: walk the shared column pair
+            line = [((r, ac1 - 1), (r, ac1)) for r in range(ar0, ar1)]
+        else:
+            # b is below a: walk the shared row pair
+            line = [((ar1 - 1, c), (ar1, c)) for c in range(ac0, ac1)]
+
+        new = []
+        run = []
+        for pair in line + [None]:
+            if pair is not None and self.is_walkable(pair[0]) and self.is_walkable(pair[1]):
+                run.append(pair)
+                continue
+            if run:
+                if len(run) >= self.LONG_ENTRANCE:
+                    new.extend((run[0], run[-1]))
+                else:
+                    new.append(run[len(run) // 2])
+                run = []
+
+        old = self.transitions.get(key, [])
+        if old == new:
+            return False
+        for x, y in old:
+            self.inter[x].discard(y)
+            self.inter[y].discard(x)
+        for x, y in new:
+            self.inter.setdefault(x, set()).add(y)
+            self.inter.setdefault(y, set()).add(x)
+        self.transitions[key] = new
+        return True
+
+    def _build_intra(self, cluster):
+        """Collect the entrances of a cluster and the BFS distances between them."""
+        nodes = set()
+        for other in self.neighbour_clusters(cluster):
+            key = (cluster, other) if cluster < other else (other, cluster)
+            for x, y in self.transitions.get(key, []):
+                nodes.add(x if self.cluster_of(x) == cluster else y)
+        self.nodes[cluster] = nodes
+
+        edges = {}
+        for node in nodes:
+            dist, _ = self._local_bfs(cluster, node)
+            edges[node] = {n: dist[n] for n in nodes if n != node and n in dist}
+        self.intra[cluster] = edges
+
+    def _local_bfs(self, cluster, start, goal=None):
+        """
+        BFS restricted to one cluster. The start (and goal, if given) are always enterable.
+
+        Returns:
+            tuple[dict, dict]: Distance and parent of every reached tile.
+        """
+        r0, r1, c0, c1 = self.bounds(cluster)
+        walkable = self.walkable[cluster]
+        dist = {start: 0}
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            cur = queue.popleft()
+            d = dist[cur] + 1
+            for dr, dc in NEIGHBOURS:
+                r, c = cur[0] + dr, cur[1] + dc
+                nb = (r, c)
+                if (r0 <= r < r1 and c0 <= c < c1 and nb not in dist
+                        and (walkable[r - r0][c - c0] or nb == goal)):
+                    dist[nb] = d
+                    parent[nb] = cur
+                    queue.append(nb)
+        return dist, parent
+
+    # ----------------------------------------------------------------- queries
+
+    def next_step(self, start, goal):
+        """
+        Return the tile to move to from start toward goal, or None when goal is
+        unreachable or already reached.
+        """
+        if not self.built:
+            self.build()
+        if goal != self.goal:
+            self.goal = goal
+            self._steps.clear()
+        if start not in self._steps:
+            path = self.find_path_prefix(start, goal)
+            self._steps[start] = path[1] if len(path) > 1 else None
+        return self._steps[start]
+
+    def find_path_prefix(self, start, goal):
+        """
+        Return the first refined part of a path from start to goal: the tiles from
+        start up to the first abstract waypoint (or to the goal). [] when unreachable.
+        """
+        if not self.built:
+            self.build()
+        if start == goal:
+            return [start]
+        start_cluster = self.cluster_of(start)
+        goal_cluster = self.cluster_of(goal)
+
+        start_dist, start_parent = self._local_bfs(start_cluster, start, goal)
+        if start_cluster == goal_cluster and goal in start_dist:
+            return self._unwind(start_parent, goal)
+
+        # Connect start and goal to the entrances of their clusters
+        start_edges = {n: start_dist[n] for n in self.nodes[start_cluster] if n in start_dist}
+        goal_dist, _ = self._local_bfs(goal_cluster, goal, goal)
+        goal_edges = {n: goal_dist[n] for n in self.nodes[goal_cluster] if n in goal_dist}
+        if not start_edges or not goal_edges:
+            return []
+
+        waypoints = self._abstract_search(start, goal, start_edges, goal_edges)
+        if not waypoints:
+            return []
+
+        # Refine only the first segment that actually moves away from start
+        for target in waypoints[1:]:
+            if target == start:
+                continue
+            if target in start_parent and self.cluster_of(target) == start_cluster:
+                return self._unwind(start_parent, target)
+            return [start, target]  # Inter-cluster edge from start itself
+        return []
+
+    def _abstract_search(self, start, goal, start_edges, goal_edges):
+        """A* over the entrance graph. Returns the list of waypoints from start to goal."""
+        gr, gc = goal
+
+        def h(tile):
+            return abs(tile[0] - gr) + abs(tile[1] - gc)
+
+        best = {start: 0}
+        parent = {start: None}
+        heap = [(h(start), 0, start)]
+        while heap:
+            _, cost, cur = heapq.heappop(heap)
+            if cur == goal:
+                path = []
+                while cur is not None:
+                    path.append(cur)
+                    cur = parent[cur]
+                return path[::-1]
+            if cost > best[cur]:
+                continue
+
+            if cur == start:
+                edges = list(start_edges.items())
+            else:
+                edges = list(self.intra[self.cluster_of(cur)].get(cur, {}).items())
+            edges.extend((n, 1) for n in self.inter.get(cur, ()))
+            if cur in goal_edges:
+                edges.append((goal, goal_edges[cur]))
+            for nb, w in edges:
+                new_cost = cost + w
+                if new_cost < best.get(nb, float('inf')):
+                    best[nb] = new_cost
+                    parent[nb] = cur
+                    heapq.heappush(heap, (new_cost + h(nb), new_cost, nb))
+        return []
+
+    @staticmethod
+    def _unwind(parent, tile):
+        path = []
+        while tile is not None:
+            path.append(tile)
+            tile = parent[tile]
+        return path[::-1]
@@ -1,36 +1,38 @@
-import random
+import random, Audio
 from Settings import *
+from Animation import AnimatedSprite, Animator, Clip, LOOP, ONCE
 from Images import IMAGES
 from Obstacles import Obstacle
-from Particle import Particle
+from ParticleSystem import ParticleSystem
+from TileGrid import BOX, OCCUPIED, PLAYER
 
-class Player(pygame.sprite.Sprite):
+class Player(AnimatedSprite):
     """
     Player class responsible for movement, animation, obstacle creation/destruction,
     and generating particle effects during interactions.
     """
-    def __init__(self, x, y):
+    def __init__(self, x, y, clock, timeline, broadphase, rng=None):
         super().__init__()
-        pygame.mixer.init()
-        self.frames = {
-            'up':    [IMAGES['PLAYER_UP_1'], IMAGES['PLAYER_UP_2'], IMAGES['PLAYER_UP_3']],
-            'down':  [IMAGES['PLAYER_DOWN_1'], IMAGES['PLAYER_DOWN_2'], IMAGES['PLAYER_DOWN_3']],
-            'left':  [IMAGES['PLAYER_LEFT_1'], IMAGES['PLAYER_LEFT_2'], IMAGES['PLAYER_LEFT_3']],
-            'right': [IMAGES['PLAYER_RIGHT_1'], IMAGES['PLAYER_RIGHT_2'], IMAGES['PLAYER_RIGHT_3']],
+        self.clock = clock
+        self.rng = rng if rng is not None else random  # The level's seeded Random
+        self.timeline = timeline
+        self.broadphase = broadphase # SpatialHash used to keep boxes from being built on enemies
+        self.anim_interval = 200
+        self.walk_clips = {
+            d: Clip([IMAGES[f'PLAYER_{d.upper()}_1'], IMAGES[f'PLAYER_{d.upper()}_2'], IMAGES[f'PLAYER_{d.upper()}_3']],
+                    self.anim_interval, LOOP)
+            for d in ['up', 'down', 'left', 'right']
         }
-        self.action_frames = {
-            d: [IMAGES[f'PLAYER_ACTION_{d.upper()}_1'], IMAGES[f'PLAYER_ACTION_{d.upper()}_2'], IMAGES[f'PLAYER_ACTION_{d.upper()}_3']]
+        self.action_clips = {
+            d: Clip([IMAGES[f'PLAYER_ACTION_{d.upper()}_1'], IMAGES[f'PLAYER_ACTION_{d.upper()}_2'], IMAGES[f'PLAYER_ACTION_{d.upper()}_3']],
+                    self.anim_interval, ONCE)
             for d in ['up', 'down', 'left', 'right']
         }
 
         self.direction = 'down'
-        self.frame_index = 0
-        self.action_frame_index = 0
         self.state = 'idle'
-        self.last_anim_time = pygame.time.get_ticks()
-        self.anim_interval = 200
+        self.animator = Animator(timeline, self.walk_clips[self.direction], self)
 
-        self.image = self.frames[self.direction][0]
         self.rect = self.image.get_rect(topleft=(x, y))
 
         # Grid position
@@ -47,7 +49,7 @@ class Player(pygame.sprite.Sprite):
         self.space_pressed_last_frame = False
 
         # Particle effects
-        self.particles = pygame.sprite.Group()
+        self.particles = ParticleSystem(seed=self.rng.getrandbits(32))
 
     def create_obs(self, obstacles, grid):
         """Queue up obstacle creation tiles in the current direction."""
@@ -56,11 +58,11 @@ class Player(pygame.sprite.Sprite):
         dy, dx = DIRECTION_VECTORS[self.direction]
         ny, nx = y + dy, x + dx
         self.pending_create.clear()
-        while 0 <= ny < grid.shape[0] and 0 <= nx < grid.shape[1] and grid[ny][nx] == 0:
+        while grid.is_free(ny, nx, OCCUPIED):
             self.pending_create.append((ny, nx))
             ny += dy
             nx += dx
-        self.next_change_time = pygame.time.get_ticks() + self.change_interval
+        self.next_change_time = self.clock.get_ticks() + self.change_interval
 
     def destroy_obs(self, obstacles, grid):
         """Queue up obstacle destruction tiles in the current direction."""
@@ -69,24 +71,23 @@ class Player(pygame.sprite.Sprite):
         dy, dx = DIRECTION_VECTORS[self.direction]
         ny, nx = y + dy, x + dx
         self.pending_destroy.clear()
-        while 0 <= ny < grid.shape[0] and 0 <= nx < grid.shape[1] and grid[ny][nx] == 1:
+        while grid.has(ny, nx, BOX):
             self.pending_destroy.append((ny, nx))
             ny += dy
             nx += dx
-        self.next_change_time = pygame.time.get_ticks() + self.change_interval
+        self.next_change_time = self.clock.get_ticks() + self.change_interval
 
     def change_obs(self, obstacles, grid):
         """Determine whether to create or destroy obstacles based on grid content."""
         y, x = self.grid_pos
         dy, dx = DIRECTION_VECTORS[self.direction]
         ny, nx = y + dy, x + dx
-        if grid[ny][nx] == 1:
+        if grid.has(ny, nx, BOX):
             self.destroy_obs(obstacles, grid)
-        elif grid[ny][nx] == 0:
+        elif grid.is_free(ny, nx, OCCUPIED):
             self.create_obs(obstacles, grid)
         self.state = 'action'
-        self.action_frame_index = 0
-        self.last_anim_time = pygame.time.get_ticks()
+        self.animator.play(self.action_clips[self.direction], restart=True)
 
     @staticmethod
     def pixel_pos_from_grid(grid_pos):
@@ -95,47 +96,40 @@ class Player(pygame.sprite.Sprite):
                 r*TILE_SIZE + MAP_OFFSET + TILE_SIZE//2]
 
     def update(self, keys, obstacles, grid):
-        """Update player state each frame including movement, animation and interaction."""
-        now = pygame.time.get_ticks()
+        """
+        Update player state each frame including movement, animation and interaction.
+
+        Args:
+            keys: Currently pressed keys.
+            obstacles (ObstacleIndex): Boxes on the map by tile.
+            grid (TileGrid): Level grid.
+        """
+        now = self.clock.get_ticks()
 
         # Handle action animation
         if self.state == 'action':
-            if now - self.last_anim_time >= self.anim_interval:
-                self.last_anim_time = now
-                self.action_frame_index += 1
-                frames = self.action_frames[self.direction]
-                if self.action_frame_index < len(frames):
-                    self.image = frames[self.action_frame_index]
-                else:
-                    self.state = 'idle'
-                    self.image = self.frames[self.direction][0]
+            if self.animator.done:
+                self.state = 'idle'
+                self.animator.stop(self.walk_clips[self.direction])
             return
 
         # Handle queued obstacle changes
         if (self.pending_destroy or self.pending_create) and now >= self.next_change_time:
             if self.pending_destroy:
                 ry, rx = self.pending_destroy.pop(0)
-                for obs in list(obstacles):
-                    oy = (obs.rect.top - MAP_OFFSET)//TILE_SIZE
-                    ox = (obs.rect.left - MAP_OFFSET)//TILE_SIZE
-                    if (oy, ox) == (ry, rx):
-                        obstacles.remove(obs)
-                        obs.kill()
-                        pygame.mixer.Sound('sounds/BREAK.mp3').play()
-                        grid[ry][rx] = 0
-                        for _ in range(20):
-                            self.particles.add(Particle(obs.rect.center))
-                        break
+                obs = obstacles.remove(ry, rx)
+                if obs is not None:
+                    Audio.play('BREAK', priority=1)
+                    grid.clear(ry, rx, BOX)
+                    self.particles.emit(obs.rect.center, 20)
             elif self.pending_create:
                 ry, rx = self.pending_create.pop(0)
                 px = rx * TILE_SIZE + MAP_OFFSET
                 py = ry * TILE_SIZE + MAP_OFFSET
-                tile_rect = pygame.Rect(px, py, TILE_SIZE, TILE_SIZE)
-                if grid[ry][rx] == 0 and not any(enemy.rect.colliderect(tile_rect) for enemy in obstacles if
-                                                 hasattr(enemy, "is_enemy") and enemy.is_enemy):
-                    obstacles.add(Obstacle(px, py, f"BOX{random.randint(0, 2)}", True, growing=True))
-                    grid[ry][rx] = 1
-                    pygame.mixer.Sound('sounds/BREAK.mp3').play()
+                if grid.is_free(ry, rx, OCCUPIED) and not self.broadphase.query_tile(ry, rx, 'enemy'):
+                    obstacles.add(ry, rx, Obstacle(px, py, f"BOX{self.rng.randint(0, 2)}", True, growing=True, timeline=self.timeline))
+                    grid.set(ry, rx, BOX)
+                    Audio.play('CREATE')
 
             self.next_change_time = now + self.change_interval
             return
@@ -151,10 +145,6 @@ class Player(pygame.sprite.Sprite):
             if abs(dx) <= self.move_speed and abs(dy) <= self.move_speed:
                 self.rect.center = self.target_pos
                 self.moving = False
-            if now - self.last_anim_time >= self.anim_interval:
-                self.last_anim_time = now
-                self.frame_index = (self.frame_index + 1) % len(self.frames[self.direction])
-                self.image = self.frames[self.direction][self.frame_index]
             return
 
         # Handle space press (interaction)
@@ -179,17 +169,16 @@ class Player(pygame.sprite.Sprite):
 
         if move:
             nr, nc = self.grid_pos[0] + move[0], self.grid_pos[1] + move[1]
-            px = nc * TILE_SIZE + MAP_OFFSET
-            py = nr * TILE_SIZE + MAP_OFFSET
-            test_rect = self.frames[self.direction][0].get_rect(topleft=(px, py))
-            if not any(test_rect.colliderect(o.rect) for o in obstacles):
-                grid[self.grid_pos[0]][self.grid_pos[1]] = 0
+            if not obstacles.blocked(nr, nc):
+                grid.move(PLAYER, self.grid_pos, (nr, nc))
                 self.grid_pos = [nr, nc]
                 self.target_pos = self.pixel_pos_from_grid(self.grid_pos)
                 self.moving = True
-            grid[self.grid_pos[0]][self.grid_pos[1]] = 3
 
-        if not self.moving:
-            self.frame_index = 0
-
-        self.image = self.frames[self.direction][self.frame_index]
\ No newline at end of file
+        # Keeps walking through the frames while moving on, otherwise stands on the first
+        if self.state == 'action':
+            return
+        if self.moving:
+            self.animator.play(self.walk_clips[self.direction])
+        else:
+            self.animator.stop(self.walk_clips[self.direction])
\ No newline at end of file
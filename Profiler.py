@@ -0,0 +1,224 @@
+import cProfile
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+PROFILE_DIR = "Profiles"
+MODES = ('sample', 'cprofile')
+SAMPLE_INTERVAL = 0.005     # Seconds between two stack samples
+MAX_DEPTH = 64              # Frames kept of each sampled stack, innermost first
+MAX_STACKS = 20_000         # Distinct stacks kept per capture; samples of further ones are only counted
+MAX_CAPTURE_SECONDS = 120   # A capture stops by itself after this long
+MAX_CAPTURES = 10           # Older captures are deleted ...
+MAX_TOTAL_MB = 50           # ... and so are the oldest ones while all captures take more than this
+
+
+def frame_label(key):
+    """Name of a (filename, first line, function) key in a collapsed stack."""
+    filename, line, name = key
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def sampled_stats(stacks, interval):
+    """
+    pstats-compatible statistics from sampled stacks: every sample a function
+    is on top of the stack counts as interval seconds of own time, every sample
+    it is anywhere on the stack as interval seconds of cumulative time.
+
+    Args:
+        stacks (dict): Tuple of (filename, line, function) keys, outermost first -> sample count.
+    """
+    stats = {}
+
+    def entry(key):
+        if key not in stats:
+            stats[key] = [0, 0, 0.0, 0.0, {}]
+        return stats[key]
+
+    for stack, count in stacks.items():
+        seconds = count * interval
+        for key in set(stack):
+            e = entry(key)
+            e[0] += count
+            e[1] += count
+            e[3] += seconds
+        entry(stack[-1])[2] += seconds
+        for caller, callee in set(zip(stack, stack[1:])):
+            edge = entry(callee)[4].setdefault(caller, [0, 0, 0.0, 0.0])
+            edge[0] += count
+            edge[1] += count
+            edge[3] += seconds
+        if len(stack) > 1:
+            entry(stack[-1])[4][stack[-2]][2] += seconds
+    return {key: (cc, nc, tt, ct, {c: tuple(v) for c, v in callers.items()})
+            for key, (cc, nc, tt, ct, callers) in stats.items()}
+
+
+class StackSampler(threading.Thread):
+    """Samples the stack of another thread every interval seconds, counted by capture tag."""
+
+    def __init__(self, capture, thread_id, interval):
+        super().__init__(name='profiler', daemon=True)
+        self.capture = capture
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.counts = Counter()  # (tag, stack) -> samples
+        self.dropped = 0         # Samples of stacks beyond MAX_STACKS
+
+    def run(self):
+        counts = self.counts
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if not stack:
+                continue
+            stack.reverse()
+            key = (self.capture.tag, tuple(stack))
+            if key in counts or len(counts) < MAX_STACKS:
+                counts[key] += 1
+            else:
+                self.dropped += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class ProfileCapture:
+    """
+    Profiles the game on demand: start() and stop(), or toggle() from a hotkey.
+
+    A sampling thread records the stack of the main thread every few ms, tagged
+    with the active game state and level, so a capture can stay cheap enough for
+    player machines. In 'cprofile' mode every function call is profiled as well,
+    with one cProfile.Profile per tag.
+
+    Each capture writes to PROFILE_DIR:
+      - capture-<time>.collapsed: "tag;frame;frame... count" lines, as read by
+        flamegraph.pl, speedscope and similar tools;
+      - capture-<time>.<tag>.pstats: statistics per tag for pstats/snakeviz, from
+        cProfile in 'cprofile' mode and from the samples otherwise.
+    Captures stop after max_seconds, and only the newest captures within
+    max_captures and max_total_mb are kept.
+    """
+
+    def __init__(self, mode='sample', directory=PROFILE_DIR, interval=SAMPLE_INTERVAL,
+                 max_seconds=MAX_CAPTURE_SECONDS, max_captures=MAX_CAPTURES, max_total_mb=MAX_TOTAL_MB):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}, expected one of {MODES}")
+        self.mode = mode
+        self.directory = directory
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.max_captures = max_captures
+        self.max_total_bytes = max_total_mb * 2**20
+        self.tag = "-"
+        self.active = False
+        self.started = 0.0
+        self.sampler = None
+        self.profiles = {}  # tag -> cProfile.Profile, in 'cprofile' mode
+        self.profile = None # The one enabled
+
+    def set_tag(self, state, level=None):
+        """Attribute the following samples to a game state (class name) and level number."""
+        tag = state if level is None else f"{state};level {level}"
+        if tag == self.tag:
+            return
+        self.tag = tag
+        if self.profile is not None:
+            self.switch_profile()
+
+    def switch_profile(self):
+        self.profile.disable()
+        self.profile = self.profiles.get(self.tag)
+        if self.profile is None:
+            self.profile = self.profiles[self.tag] = cProfile.Profile()
+        self.profile.enable()
+
+    def toggle(self):
+        """Start a capture, or stop the running one and return the files written."""
+        if self.active:
+            return self.stop()
+        self.start()
+        return []
+
+    def start(self):
+        """Start a capture. Call from the thread to profile (the main thread)."""
+        if self.active:
+            return
+        self.active = True
+        self.started = time.perf_counter()
+        self.sampler = StackSampler(self, threading.get_ident(), self.interval)
+        self.sampler.start()
+        if self.mode == 'cprofile':
+            self.profiles = {self.tag: cProfile.Profile()}
+            self.profile = self.profiles[self.tag]
+            self.profile.enable()
+        print(f"profiling ({self.mode}) started")
+
+    def check(self):
+        """Stop the capture once it has run for max_seconds. Call once per frame."""
+        if self.active and time.perf_counter() - self.started >= self.max_seconds:
+            self.stop()
+
+    def stop(self):
+        """Stop the capture, write it and rotate old captures. Returns the paths written."""
+        if not self.active:
+            return []
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile = None
+        self.sampler.stop()
+        self.active = False
+        paths = self.write(self.sampler.counts, time.perf_counter() - self.started)
+        self.profiles = {}
+        self.rotate()
+        dropped = f", {self.sampler.dropped} samples of uncounted stacks" if self.sampler.dropped else ""
+        print(f"profile capture written to {paths[0]} and {len(paths) - 1} pstats files{dropped}")
+        return paths
+
+    def write(self, counts, seconds):
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, time.strftime("capture-%Y%m%d-%H%M%S") +
+                            f"-{int(time.time() * 1000) % 1000:03d}")
+        collapsed = base + ".collapsed"
+        with open(collapsed, "w") as f:
+            for (tag, stack), count in sorted(counts.items()):
+                f.write(f"{tag};{';'.join(map(frame_label, stack))} {count}\n")
+        paths = [collapsed]
+
+        by_tag = {}
+        for (tag, stack), count in counts.items():
+            by_tag.setdefault(tag, {})[stack] = count
+        tags = self.profiles if self.mode == 'cprofile' else by_tag
+        for tag in tags:
+            path = f"{base}.{tag.replace(';', '.').replace(' ', '')}.pstats"
+            if self.mode == 'cprofile':
+                self.profiles[tag].dump_stats(path)
+            else:
+                with open(path, "wb") as f:
+                    marshal.dump(sampled_stats(by_tag[tag], self.interval), f)
+            paths.append(path)
+        return paths
+
+    def rotate(self):
+        """Delete the oldest captures beyond max_captures or max_total_bytes (keeping the newest)."""
+        captures = {}
+        for name in os.listdir(self.directory):
+            if name.startswith("capture-"):
+                path = os.path.join(self.directory, name)
+                captures.setdefault(name.split(".")[0], []).append(path)
+        order = sorted(captures)
+        total = sum(os.path.getsize(p) for paths in captures.values() for p in paths)
+        while len(order) > 1 and (len(order) > self.max_captures or total > self.max_total_bytes):
+            for path in captures[order.pop(0)]:
+                total -= os.path.getsize(path)
+                os.remove(path)
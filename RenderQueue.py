@@ -0,0 +1,127 @@
+import pygame
+
+# Z-layers, drawn back to front in DEFAULT_ORDER
+LAYER_GROUND = 'ground'
+LAYER_FRUIT = 'fruit'
+LAYER_ACTORS = 'actors'
+LAYER_OBSTACLES = 'obstacles'
+LAYER_FLYING = 'flying'
+LAYER_PARTICLES = 'particles'
+LAYER_HUD = 'hud'
+
+DEFAULT_ORDER = (LAYER_GROUND, LAYER_FRUIT, LAYER_ACTORS, LAYER_OBSTACLES,
+                 LAYER_FLYING, LAYER_PARTICLES, LAYER_HUD)
+
+
+class RenderQueue:
+    """
+    Everything a level draws, sorted into z-layers.
+
+    Sprites are registered once with add() and leave their layer when they are
+    killed. Whole groups and providers (callables returning (key, image, pos)
+    items, e.g. MenuBar.blit_items) can be attached to a layer as well. Each
+    frame every layer is submitted with a single Surface.blits() call, and the
+    number of blits issued is kept in `blits`.
+    """
+
+    def __init__(self, order=DEFAULT_ORDER):
+        self.layers = {layer: pygame.sprite.Group() for layer in DEFAULT_ORDER}
+        self.sources = {layer: [] for layer in DEFAULT_ORDER}
+        self.direct = {}  # source -> its own draw callable
+        for layer, group in self.layers.items():
+            self.attach(layer, group)
+        self.culls = {}
+        self.set_order(order)
+        self.blits = 0  # Blits issued by the last draw()
+
+    def set_order(self, order):
+        """Change the back-to-front order of the layers."""
+        if sorted(order) != sorted(DEFAULT_ORDER):
+            raise ValueError(f"Render order must contain each of {DEFAULT_ORDER} once")
+        self.order = tuple(order)
+
+    def add(self, sprite, layer):
+        self.layers[layer].add(sprite)
+
+    def remove(self, sprite):
+        sprite.remove(*self.layers.values())
+
+    def move(self, sprite, layer):
+        """Put a registered sprite on another layer."""
+        self.remove(sprite)
+        self.add(sprite, layer)
+
+    def attach(self, layer, source, draw=None):
+        """
+        Draw an extra source on a layer.
+
+        Args:
+            source: A sprite Group, drawn as a whole, or a callable returning
+                    (key, image, pos) items.
+            draw: Optional callable(surface) -> blit count, used by draw() instead of
+                  the items, for sources with a faster way to draw themselves.
+        """
+        if isinstance(source, pygame.sprite.AbstractGroup):
+            group = source
+            source = lambda position: self.group_items(layer, group, position)
+        else:
+            provider = source
+            source = lambda position: provider()
+        self.sources[layer].append(source)
+        if draw is not None:
+            self.direct[source] = draw
+
+    def set_cull(self, layer, predicate):
+        """Skip the sprites of a layer for which predicate(sprite) is true."""
+        self.culls[layer] = predicate
+
+    def group_items(self, layer, group, position):
+        cull = self.culls.get(layer)
+        if cull is None:
+            return [(s, s.image, position(s)) for s in group]
+        return [(s, s.image, position(s)) for s in group if not cull(s)]
+
+    def layer_items(self, layer, position):
+        """
+        (key, image, pos) items of one layer.
+
+        Args:
+            position: Callable returning the screen position to draw a sprite at.
+        """
+        items = []
+        for source in self.sources[layer]:
+            items += source(position)
+        return items
+
+    def items(self, position, skip=()):
+        """(key, image, pos) items of all layers in draw order, except those in skip."""
+        items = []
+        for layer in self.order:
+            if layer not in skip:
+                items += self.layer_items(layer, position)
+        return items
+
+    def draw(self, surface, position):
+        """
+        Draw all layers with one Surface.blits() call per non-empty layer
+        (plus one per source that draws itself).
+        """
+        count = 0
+        for layer in self.order:
+            batch = []
+            for source in self.sources[layer]:
+                draw = self.direct.get(source)
+                if draw is None:
+                    batch += [(image, pos) for _, image, pos in source(position)]
+                else:
+                    # Keeps the draw order within the layer
+                    if batch:
+                        surface.blits(batch, False)
+                        count += len(batch)
+                        batch = []
+                    count += draw(surface)
+            if batch:
+                surface.blits(batch, False)
+                count += len(batch)
+        self.blits = count
+        return count
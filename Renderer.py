@@ -0,0 +1,101 @@
+import pygame
+
+class DirtyRenderer:
+    """
+    Redraws only the parts of the screen that changed since the previous frame.
+
+    Each frame render() gets the complete list of things to draw as
+    (key, image, pos) items in back-to-front order. An item counts as changed when
+    its image, position or alpha differs from the last frame under the same key;
+    its old and new rects become dirty, and so does the old rect of every key
+    that disappeared. Inside each dirty rect the background is restored and the
+    items overlapping it are blitted again, clipped to the rect.
+
+    When the dirty area is larger than full_redraw_ratio of the screen (or after
+    invalidate()), the whole frame is drawn instead. Changes to the background
+    itself are reported with mark_dirty().
+    """
+
+    def __init__(self, background, full_redraw_ratio=0.5):
+        self.background = background
+        self.full_redraw_ratio = full_redraw_ratio
+        self.previous = {}  # key -> (image, rect, alpha) drawn in the last frame
+        self.full = True    # Nothing drawn yet
+        self.pending = []   # Areas where the background itself changed
+        self.stats = {"frames": 0, "full_redraws": 0, "dirty_rects": 0, "blits": 0}
+        self.blits = 0  # Blits issued by the last render()
+
+    def invalidate(self):
+        """Draw the whole frame next time, e.g. after something else drew onto the screen."""
+        self.full = True
+
+    def mark_dirty(self, rect):
+        """Redraw rect next frame because the background changed there."""
+        self.pending.append(pygame.Rect(rect))
+
+    def render(self, surface, items):
+        """
+        Draw a frame.
+
+        Args:
+            items: Iterable of (key, image, pos) in draw order; keys must be unique and hashable.
+
+        Returns:
+            list[pygame.Rect]: The screen areas that changed, for pygame.display.update().
+        """
+        stats = self.stats
+        stats["frames"] += 1
+        previous = self.previous
+        current = {}
+        blits = []
+        dirty = self.pending
+        self.pending = []
+        for key, image, pos in items:
+            rect = image.get_rect(topleft=pos)
+            state = (image, rect, image.get_alpha())
+            current[key] = state
+            blits.append((image, rect))
+            old = previous.pop(key, None)
+            if old != state:
+                dirty.append(rect)
+                if old is not None:
+                    dirty.append(old[1])
+        dirty.extend(old[1] for old in previous.values())  # Keys no longer drawn
+        self.previous = current
+
+        screen_rect = surface.get_rect()
+        dirty = self.merge([r.clip(screen_rect) for r in dirty if r.colliderect(screen_rect)])
+        area = sum(r.w * r.h for r in dirty)
+        if self.full or area > self.full_redraw_ratio * screen_rect.w * screen_rect.h:
+            self.full = False
+            surface.blit(self.background, (0, 0))
+            surface.blits(blits, False)
+            stats["full_redraws"] += 1
+            self.blits = len(blits) + 1
+            stats["blits"] += self.blits
+            return [screen_rect]
+
+        rects = [rect for _, rect in blits]
+        self.blits = 0
+        for area_rect in dirty:
+            surface.set_clip(area_rect)
+            surface.blit(self.background, area_rect, area_rect)
+            hits = area_rect.collidelistall(rects)
+            surface.blits([blits[i] for i in hits], False)
+            self.blits += len(hits) + 1
+        surface.set_clip(None)
+        stats["blits"] += self.blits
+        stats["dirty_rects"] += len(dirty)
+        return dirty
+
+    @staticmethod
+    def merge(rects):
+        """Union overlapping rects so no pixel is redrawn twice in a frame."""
+        merged = []
+        for rect in rects:
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect = rect.union(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
@@ -0,0 +1,210 @@
+import os
+import struct
+import time
+import zlib
+import pygame
+from Level import Level
+from Maps import LEVELS
+
+REPLAY_DIR = "Replays"
+MAGIC = b"FRPL"
+VERSION = 1
+
+# Keys read by a level, one bit each in the per-tick key masks
+KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE)
+
+# Outcome of a recorded run
+LOST, WON, UNFINISHED = 0, 1, 2
+OUTCOMES = {LOST: "lost", WON: "won", UNFINISHED: "unfinished"}
+
+# magic, version, level number, map checksum, seed, ticks, outcome, number of runs
+HEADER = struct.Struct("<4sBHIIIBI")
+
+
+def key_mask(keys):
+    """Bitmask of the KEYS held in keys (as returned by pygame.key.get_pressed())."""
+    mask = 0
+    for bit, key in enumerate(KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+
+class MaskKeys:
+    """Stand-in for pygame.key.get_pressed() from a key mask: keys[k] is True for the KEYS held."""
+
+    __slots__ = ('held',)
+
+    def __init__(self, mask):
+        self.held = frozenset(key for bit, key in enumerate(KEYS) if mask >> bit & 1)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+MASK_KEYS = [MaskKeys(mask) for mask in range(1 << len(KEYS))]
+
+
+def map_checksum(lvl_idx):
+    """CRC32 of a level's map, so replays of a map that has changed since are refused."""
+    return zlib.crc32("\n".join(LEVELS[f"LEVEL_{lvl_idx}"][1]).encode())
+
+
+def outcome_of(level):
+    if level.running:
+        return UNFINISHED
+    return WON if level.won else LOST
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Recording:
+    """
+    The input of one run of a level: its seed and the key mask of every tick,
+    run-length encoded as [mask, ticks] pairs, plus how the run ended.
+
+    On disk it is a HEADER followed by one mask byte and a varint tick count per run,
+    so a minute of play usually takes well under a kilobyte.
+    """
+
+    def __init__(self, lvl_idx, seed, checksum=None):
+        self.lvl_idx = lvl_idx
+        self.seed = seed
+        self.checksum = checksum if checksum is not None else map_checksum(lvl_idx)
+        self.runs = []  # [mask, ticks]
+        self.ticks = 0
+        self.outcome = UNFINISHED
+
+    def add(self, mask):
+        """Append one tick of input."""
+        runs = self.runs
+        if runs and runs[-1][0] == mask:
+            runs[-1][1] += 1
+        else:
+            runs.append([mask, 1])
+        self.ticks += 1
+
+    def keys(self):
+        """The input of every tick, as pygame.key.get_pressed() stand-ins."""
+        for mask, ticks in self.runs:
+            keys = MASK_KEYS[mask]
+            for _ in range(ticks):
+                yield keys
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.lvl_idx, self.checksum, self.seed,
+                                    self.ticks, self.outcome, len(self.runs)))
+        for mask, ticks in self.runs:
+            out.append(mask)
+            write_varint(out, ticks)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, lvl_idx, checksum, seed, ticks, outcome, count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a replay file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}, expected {VERSION}")
+        recording = cls(lvl_idx, seed, checksum)
+        pos = HEADER.size
+        for _ in range(count):
+            mask = data[pos]
+            n, pos = read_varint(data, pos + 1)
+            recording.runs.append([mask, n])
+        recording.ticks = sum(n for _, n in recording.runs)
+        if recording.ticks != ticks:
+            raise ValueError(f"Replay is damaged: {recording.ticks} ticks of input, {ticks} expected")
+        recording.outcome = outcome
+        return recording
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class InputRecorder:
+    """
+    Records the input of every level played to a file in directory, one per run.
+
+    PlayState calls begin() with each new level, record() with the keys of every
+    tick and finish() once the level has ended; runs that are left for the menu
+    or restarted are saved as UNFINISHED. While disabled every call returns at once.
+    """
+
+    def __init__(self, directory=REPLAY_DIR, enabled=False):
+        self.directory = directory
+        self.enabled = enabled
+        self.level = None
+        self.recording = None
+
+    def begin(self, level):
+        """Start recording a level, saving the previous recording if it was not finished."""
+        if not self.enabled:
+            return
+        self.finish()
+        self.level = level
+        self.recording = Recording(level.lvl_idx, level.seed)
+
+    def record(self, keys):
+        """Record the keys of one tick; call before the level is updated with them."""
+        if self.recording is not None:
+            self.recording.add(key_mask(keys))
+
+    def finish(self):
+        """Save the recording of the current level, if any. Returns its path, or None."""
+        if self.recording is None:
+            return None
+        recording = self.recording
+        recording.outcome = outcome_of(self.level)
+        self.level = self.recording = None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"level{recording.lvl_idx}-" + time.strftime("%Y%m%d-%H%M%S") +
+                            f"-{int(time.time() * 1000) % 1000:03d}.rpl")
+        recording.save(path)
+        print(f"replay written to {path}: {recording.ticks} ticks, {OUTCOMES[recording.outcome]}")
+        return path
+
+
+def replay(recording, draw_to=None):
+    """
+    Play a recording headless, one tick per recorded key mask, as fast as possible.
+
+    Args:
+        recording (Recording): Input to play back.
+        draw_to (pygame.Surface): Also draw every tick onto this surface, if given.
+
+    Returns:
+        Level: The level once its input has run out or it has ended.
+    """
+    if recording.checksum != map_checksum(recording.lvl_idx):
+        raise ValueError(f"Level {recording.lvl_idx} has changed since the replay was recorded")
+    level = Level(LEVELS[f"LEVEL_{recording.lvl_idx}"][1], recording.lvl_idx, save_times=False, seed=recording.seed)
+    for keys in recording.keys():
+        level.update(keys)
+        if draw_to is not None:
+            level.draw(draw_to)
+        if not level.running:
+            break
+    return level
@@ -1,4 +1,4 @@
-import pygame
+import TextCache
 
 class ScoreBoard:
     """
@@ -8,11 +8,11 @@ class ScoreBoard:
 
     def __init__(self, font_path="Assets/Adumu.ttf", file_path="Assets/best_times.txt"):
         self.file_path = file_path
-        self.font = pygame.font.Font(font_path, 36)
-        self.title_font = pygame.font.Font(font_path, 60)
+        self.font_path = font_path
         self.font_color = (50, 100, 48)
         self.total_levels = 12
         self.best_times = self.load_best_times()
+        self.title, self.lines = self.render_lines()
 
     def load_best_times(self):
         times = {}
@@ -27,10 +27,10 @@ class ScoreBoard:
             pass
         return times
 
-    def draw(self, screen, x=100, y=100):
-        title = self.title_font.render("BEST TIMES", True, self.font_color)
-        screen.blit(title, (x+115, y-20))
-
+    def render_lines(self):
+        """Render the title and one line per level once; draw() only blits them."""
+        title = TextCache.render("BEST TIMES", 60, self.font_color, self.font_path)
+        lines = []
         for i in range(1, self.total_levels + 1):
             seconds = self.best_times.get(i)
             if seconds is not None:
@@ -39,13 +39,17 @@ class ScoreBoard:
                 time_str = f"{minutes:02d}:{sec:02d}"
             else:
                 time_str = "None"
+            lines.append(TextCache.render(f"Level {i}: {time_str}", 36, self.font_color, self.font_path))
+        return title, lines
 
+    def draw(self, screen, x=100, y=100):
+        screen.blit(self.title, (x+115, y-20))
 
+        for i, text in enumerate(self.lines, start=1):
             col = 0 if i <= 6 else 1
             row = (i - 1) % 6
 
             dx = x + col * 300
             dy = y + 60 + row * 40
 
-            text = self.font.render(f"Level {i}: {time_str}", True, self.font_color)
-            screen.blit(text, (dx, dy))
\ No newline at end of file
+            screen.blit(text, (dx, dy))
@@ -2,7 +2,15 @@ WIDTH, HEIGHT = 1000, 750
 TILE_SIZE = 50
 MAP_OFFSET = 25
 FPS = 60
+TICK_MS = 1000 / FPS  # Fixed logic timestep; all movement speeds are per tick
+MAX_TICKS_PER_FRAME = 5  # Logic ticks run before a draw is forced when the game falls behind
+HPA_MIN_TILES = 10_000  # Grids with at least this many tiles use hierarchical pathfinding
+HPA_CLUSTER_SIZE = 10
+DIRTY_RECTS = True  # Redraw and present only the changed parts of the gameplay screen
+DIRTY_REDRAW_RATIO = 0.5  # Above this fraction of the screen, redraw everything instead
+DEBUG_GRID = False  # Check every tick that nothing writes Level.grid behind the TileGrid API
 import pygame
+import Audio
 
 DIRECTION_VECTORS = {
     'left':  (0, -1),
@@ -17,13 +25,10 @@ GREEN = (0, 255, 0)
 BLACK = (0, 0, 0)
 
 def start_music():
-    pygame.mixer.init()
-    pygame.mixer.music.load("Sounds/las.mp3")
-    pygame.mixer.music.set_volume(1.0)
-    pygame.mixer.music.play(-1)
+    Audio.start_music("Sounds/las.mp3")
 
 def stop_music():
-    pygame.mixer.music.stop()
+    Audio.stop_music()
 
 
 #------------ BUTTONS ---------------
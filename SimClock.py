@@ -0,0 +1,41 @@
+from Settings import *
+
+class SimClock:
+    """
+    Simulation clock owned by a Level and read by every entity instead of
+    pygame.time.get_ticks().
+
+    In real-time mode (step_ms=None) each tick samples the wall clock.
+    In stepped mode each tick advances the time by a fixed number of ms,
+    so a level can be simulated headless as fast as the CPU allows.
+    """
+
+    def __init__(self, step_ms=None, start_ms=None):
+        """
+        Args:
+            step_ms (int | float | None): Milliseconds per tick, or None for real time.
+            start_ms (int | None): Initial time. Defaults to the wall clock in
+                real-time mode and to 0 in stepped mode.
+        """
+        self.step_ms = step_ms
+        if start_ms is None:
+            start_ms = pygame.time.get_ticks() if step_ms is None else 0
+        self._time = start_ms
+        self.ticks = 0
+
+    @property
+    def stepped(self):
+        return self.step_ms is not None
+
+    def tick(self):
+        """Advance the clock by one simulation tick and return the new time."""
+        if self.step_ms is None:
+            self._time = pygame.time.get_ticks()
+        else:
+            self._time += self.step_ms
+        self.ticks += 1
+        return self.get_ticks()
+
+    def get_ticks(self):
+        """Current simulation time in milliseconds (same meaning as pygame.time.get_ticks)."""
+        return int(self._time)
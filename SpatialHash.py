@@ -0,0 +1,86 @@
+from Settings import *
+
+class SpatialHash:
+    """
+    Uniform-grid broadphase for dynamic entities (player, enemies, fruits).
+
+    Every sprite is stored in the cells its rect overlaps, together with a tag
+    such as 'enemy' or 'fruit'. Cells are aligned with the map tiles, so a sprite
+    standing on a tile occupies one cell and a moving one at most four.
+    Level calls update() after entities move; the sprite is only re-filed when
+    its cell range changes. Queries only look at the cells a rect overlaps, so
+    their cost does not grow with the number of entities on the map.
+    """
+
+    def __init__(self, cell_size=TILE_SIZE, offset=MAP_OFFSET):
+        self.cell_size = cell_size
+        self.offset = offset
+        self.cells = {}    # (col, row) -> set of sprites
+        self.entries = {}  # sprite -> [cell range, tag]
+
+    def cell_range(self, rect):
+        """Return (c0, r0, c1, r1), the inclusive range of cells a rect overlaps."""
+        cs, off = self.cell_size, self.offset
+        return ((rect.left - off) // cs, (rect.top - off) // cs,
+                (rect.right - 1 - off) // cs, (rect.bottom - 1 - off) // cs)
+
+    def _file(self, sprite, cells):
+        c0, r0, c1, r1 = cells
+        for c in range(c0, c1 + 1):
+            for r in range(r0, r1 + 1):
+                self.cells.setdefault((c, r), set()).add(sprite)
+
+    def _unfile(self, sprite, cells):
+        c0, r0, c1, r1 = cells
+        for c in range(c0, c1 + 1):
+            for r in range(r0, r1 + 1):
+                bucket = self.cells.get((c, r))
+                if bucket is not None:
+                    bucket.discard(sprite)
+                    if not bucket:
+                        del self.cells[(c, r)]
+
+    def insert(self, sprite, tag=None):
+        cells = self.cell_range(sprite.rect)
+        self.entries[sprite] = [cells, tag]
+        self._file(sprite, cells)
+
+    def remove(self, sprite):
+        entry = self.entries.pop(sprite, None)
+        if entry is not None:
+            self._unfile(sprite, entry[0])
+
+    def update(self, sprite):
+        """Re-file a sprite if it moved into a different set of cells."""
+        entry = self.entries[sprite]
+        cells = self.cell_range(sprite.rect)
+        if cells != entry[0]:
+            self._unfile(sprite, entry[0])
+            self._file(sprite, cells)
+            entry[0] = cells
+
+    def update_all(self, sprites):
+        for sprite in sprites:
+            self.update(sprite)
+
+    def query(self, rect, tag=None):
+        """Return the sprites (optionally only those with the given tag) whose rect overlaps rect."""
+        c0, r0, c1, r1 = self.cell_range(rect)
+        found = set()
+        for c in range(c0, c1 + 1):
+            for r in range(r0, r1 + 1):
+                bucket = self.cells.get((c, r))
+                if bucket:
+                    found.update(bucket)
+        entries = self.entries
+        return [s for s in found
+                if (tag is None or entries[s][1] == tag) and s.rect.colliderect(rect)]
+
+    def query_tile(self, row, col, tag=None):
+        """Return the sprites overlapping the map tile (row, col)."""
+        cs, off = self.cell_size, self.offset
+        return self.query(pygame.Rect(col * cs + off, row * cs + off, cs, cs), tag)
+
+    def any(self, rect, tag=None):
+        """True if at least one sprite (with the given tag) overlaps rect."""
+        return bool(self.query(rect, tag))
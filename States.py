@@ -1,15 +1,32 @@
 from ABC_Game_State import GameState
 from Settings import *
 from Images import IMAGES
+from AssetLoader import ALL
 from Level import Level
 from Maps import LEVELS
 from ScoreBoard import ScoreBoard
 
 
+def start_level(game, lvl_num):
+    """
+    Build level lvl_num, replacing the current level, and play it.
+    Used for the first start as well as for restarts and the next level.
+    """
+    game.recorder.finish()
+    game.memory.exit_level()  # Reported while the old level is still alive...
+    game.level = None         # ... which is then released before the new one is built
+    game.current_lvl = lvl_num
+    game.assets.wait(PlayState.ASSETS)  # Sprites are used while building the level
+    game.level = Level(LEVELS[f"LEVEL_{lvl_num}"][1], lvl_num)
+    game.change_state(PlayState(game))
+
+
 class MainMenuState(GameState):
     """
     Represents the main menu screen where the player starts the game.
     """
+    ASSETS = ("FOREST",)
+
     def __init__(self, game):
         self.game = game
         self.start_rect = start_rect
@@ -38,6 +55,8 @@ class LevelSelectState(GameState):
     """
     Allows the player to select a level from the available options.
     """
+    ASSETS = ("LEVELS",)
+
     def __init__(self, game):
         self.game = game
         self.menu_rect = lvl_menu_rect
@@ -47,12 +66,9 @@ class LevelSelectState(GameState):
             if self.menu_rect.collidepoint(event.pos):
                 self.game.change_state(MainMenuState(self.game))
             mx, my = event.pos
-            for lvl_name, (rect, mapa) in LEVELS.items():
+            for lvl_name, (rect, _) in LEVELS.items():
                 if rect.collidepoint(mx, my):
-                    lvl_num = int(lvl_name.split('_')[1])
-                    self.game.current_lvl = lvl_num
-                    self.game.level = Level(mapa, lvl_num)
-                    self.game.change_state(PlayState(self.game))
+                    start_level(self.game, int(lvl_name.split('_')[1]))
                     break
 
     def update(self, keys):
@@ -66,38 +82,47 @@ class PlayState(GameState):
     """
     Active gameplay state where the player moves and interacts with the game.
     """
+    ASSETS = ALL
+    IN_LEVEL = True
+
     def __init__(self, game):
         self.game = game
         self.restart_rect = game_restart_rect
         self.menu_rect = game_menu_rect
+        game.level.frame_timer = game.frame_timer
+        game.recorder.begin(game.level)
 
     def handle_input(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if self.restart_rect.collidepoint(event.pos):
-                key = f"LEVEL_{self.game.current_lvl}"
-                mapa = LEVELS[key][1]
-                self.game.level = Level(mapa, self.game.current_lvl)
-                self.game.change_state(PlayState(self.game))
+                start_level(self.game, self.game.current_lvl)
             elif self.menu_rect.collidepoint(event.pos):
                 stop_music()
                 self.game.change_state(MainMenuState(self.game))
+        elif event.type == pygame.WINDOWEXPOSED and self.game.level.renderer is not None:
+            self.game.level.renderer.invalidate()
 
     def update(self, keys):
+        self.game.recorder.record(keys)
         self.game.level.update(keys)
         if not self.game.level.running:
+            self.game.recorder.finish()
             if self.game.level.won:
                 self.game.change_state(GameOverWinState(self.game))
             else:
                 self.game.change_state(GameOverLostState(self.game))
 
     def draw(self, screen):
-        self.game.level.draw(screen)
+        return self.game.level.draw(screen, self.game.render_alpha)
 
 
 class GameOverWinState(GameState):
     """
     State shown when the player completes a level successfully.
     """
+    ASSETS = ("OVERLAY", "YOU_WON")
+    IN_LEVEL = True
+
     def __init__(self, game):
         self.game = game
         self.next_level_rect = next_rect
@@ -107,12 +132,8 @@ class GameOverWinState(GameState):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if self.next_level_rect.collidepoint(event.pos):
                 nxt = self.game.current_lvl + 1
-                key = f"LEVEL_{nxt}"
-                if key in LEVELS:
-                    mapa = LEVELS[key][1]
-                    self.game.current_lvl = nxt
-                    self.game.level = Level(mapa, nxt)
-                    self.game.change_state(PlayState(self.game))
+                if f"LEVEL_{nxt}" in LEVELS:
+                    start_level(self.game, nxt)
                 else:
                     stop_music()
                     self.game.change_state(MainMenuState(self.game))
@@ -133,6 +154,9 @@ class GameOverLostState(GameState):
     """
     State shown when the player fails a level.
     """
+    ASSETS = ("OVERLAY", "GAME_OVER")
+    IN_LEVEL = True
+
     def __init__(self, game):
         self.game = game
         self.restart_rect = restart_rect
@@ -142,10 +166,7 @@ class GameOverLostState(GameState):
     def handle_input(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if self.restart_rect.collidepoint(event.pos):
-                key = f"LEVEL_{self.game.current_lvl}"
-                mapa = LEVELS[key][1]
-                self.game.level = Level(mapa, self.game.current_lvl)
-                self.game.change_state(PlayState(self.game))
+                start_level(self.game, self.game.current_lvl)
             elif self.menu_rect.collidepoint(event.pos):
                 stop_music()
                 self.game.change_state(MainMenuState(self.game))
@@ -159,6 +180,8 @@ class GameOverLostState(GameState):
 
 
 class Scores_State(GameState):
+    ASSETS = ("SCORES",)
+
     def __init__(self, game):
         self.game = game
         self.menu_rect = menu_rect_scores
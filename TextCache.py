@@ -0,0 +1,42 @@
+import pygame
+from collections import OrderedDict
+
+FONT_PATH = "Assets/Adumu.ttf"
+MAX_SURFACES = 128  # Rendered strings kept before the least recently used is dropped
+
+FONTS = {}                # (path, size) -> pygame.font.Font
+_surfaces = OrderedDict() # (path, size, text, color) -> rendered Surface
+stats = {"hits": 0, "misses": 0, "fonts_loaded": 0}
+
+
+def get_font(size, path=FONT_PATH):
+    """Return the shared Font for (path, size), opening the file only the first time."""
+    font = FONTS.get((path, size))
+    if font is None:
+        font = FONTS[(path, size)] = pygame.font.Font(path, size)
+        stats["fonts_loaded"] += 1
+    return font
+
+
+def render(text, size, color, path=FONT_PATH):
+    """
+    Return an antialiased Surface with text, rendering it only on a cache miss.
+    The returned Surface is shared, so callers must not draw onto it.
+    """
+    key = (path, size, text, tuple(color))
+    surf = _surfaces.get(key)
+    if surf is not None:
+        _surfaces.move_to_end(key)
+        stats["hits"] += 1
+        return surf
+
+    stats["misses"] += 1
+    surf = _surfaces[key] = get_font(size, path).render(text, True, color)
+    if len(_surfaces) > MAX_SURFACES:
+        _surfaces.popitem(last=False)
+    return surf
+
+
+def report():
+    return (f"text cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['fonts_loaded']} fonts loaded, {len(_surfaces)} surfaces cached")
@@ -0,0 +1,170 @@
+from collections import deque
+
+# Tile layer flags. A tile can hold several of them at once.
+STATIC = 1   # Fixed wall (anything outside the map also reads as STATIC)
+BOX = 2      # Destructible box
+ENEMY = 4
+PLAYER = 8
+FRUIT = 16
+
+BLOCKING = STATIC | BOX              # Tiles nobody can walk into
+OCCUPIED = BLOCKING | ENEMY | PLAYER # Tiles a box cannot be built on / a pineapple cannot land on
+ALL_LAYERS = 0xFF
+
+DYNAMIC_LAYERS = (ENEMY, PLAYER, FRUIT)
+DIRTY_LOG_SIZE = 1024  # Tile changes remembered for changes_since()
+
+
+class TileGrid:
+    """
+    Compact level grid: one uint8 of layer flags per tile in a flat bytearray.
+
+    Wall layers (STATIC, BOX) are plain bits set with set()/clear(). Entity layers
+    (ENEMY, PLAYER, FRUIT) are reference counted through occupy()/vacate(), so two
+    entities sharing a tile never erase each other's mark. view() exposes the flags
+    as a zero-copy, read-only 2D NumPy array for vectorized consumers.
+
+    Every change of a tile's flags bumps `version`, is appended to a bounded
+    dirty log and is reported to the subscribers whose mask it touches, so derived
+    data (paths, exit masks, baked tiles) can be cached and invalidated per tile.
+    In debug mode verify() detects writes that bypassed this API.
+    """
+
+    def __init__(self, rows, cols, debug=False):
+        self.rows = rows
+        self.cols = cols
+        self.cells = bytearray(rows * cols)
+        self._counts = {flag: bytearray(rows * cols) for flag in DYNAMIC_LAYERS}
+
+        self.version = 0
+        self.dirty = deque(maxlen=DIRTY_LOG_SIZE)  # (version, row, col, old, new)
+        self._subscribers = []                     # [(callback, mask)]
+
+        self.debug = debug
+        self._shadow = bytearray(self.cells) if debug else None
+
+    @classmethod
+    def from_map(cls, level_data, debug=False):
+        """Empty grid sized to a map from Maps.py (rows may differ in length)."""
+        return cls(len(level_data), max(len(row) for row in level_data), debug)
+
+    @classmethod
+    def from_walls(cls, walls, flag=STATIC):
+        """Grid whose truthy entries in a 2D array-like are set to flag."""
+        rows, cols = len(walls), len(walls[0])
+        grid = cls(rows, cols)
+        for r, row in enumerate(walls):
+            for c, wall in enumerate(row):
+                if wall:
+                    grid.cells[r * cols + c] = flag
+        return grid
+
+    @property
+    def shape(self):
+        return (self.rows, self.cols)
+
+    def in_bounds(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    # ------------------------------------------------------------------ reading
+
+    def get(self, row, col):
+        """Flags of a tile; tiles outside the map read as STATIC."""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self.cells[row * self.cols + col]
+        return STATIC
+
+    def has(self, row, col, flags):
+        """True if the tile holds any of the given flags."""
+        return bool(self.get(row, col) & flags)
+
+    def is_free(self, row, col, mask=BLOCKING):
+        """True if the tile is inside the map and holds none of the flags in mask."""
+        return not self.get(row, col) & mask
+
+    def view(self):
+        """Zero-copy, read-only (rows, cols) uint8 NumPy view of the flags."""
+        import numpy as np
+        view = np.frombuffer(self.cells, dtype=np.uint8).reshape(self.rows, self.cols)
+        view.flags.writeable = False
+        return view
+
+    # ------------------------------------------------------------------ writing
+
+    def _write(self, i, new):
+        old = self.cells[i]
+        if old == new:
+            return
+        self.cells[i] = new
+        if self._shadow is not None:
+            self._shadow[i] = new
+        self.version += 1
+        row, col = divmod(i, self.cols)
+        self.dirty.append((self.version, row, col, old, new))
+        changed = old ^ new
+        for callback, mask in self._subscribers:
+            if changed & mask:
+                callback(row, col, old, new)
+
+    def set(self, row, col, flags):
+        i = row * self.cols + col
+        self._write(i, self.cells[i] | flags)
+
+    def clear(self, row, col, flags):
+        i = row * self.cols + col
+        self._write(i, self.cells[i] & ~flags & 0xFF)
+
+    def occupy(self, row, col, flag):
+        """Add one entity of a dynamic layer to a tile."""
+        i = row * self.cols + col
+        self._counts[flag][i] += 1
+        self._write(i, self.cells[i] | flag)
+
+    def vacate(self, row, col, flag):
+        """Remove one entity of a dynamic layer from a tile."""
+        i = row * self.cols + col
+        counts = self._counts[flag]
+        if counts[i]:
+            counts[i] -= 1
+            if not counts[i]:
+                self._write(i, self.cells[i] & ~flag & 0xFF)
+
+    def move(self, flag, old, new):
+        """Move one entity of a dynamic layer from tile old to tile new."""
+        self.vacate(old[0], old[1], flag)
+        self.occupy(new[0], new[1], flag)
+
+    # ------------------------------------------------------------ notifications
+
+    def subscribe(self, callback, mask=ALL_LAYERS):
+        """
+        Call callback(row, col, old_flags, new_flags) after every tile change
+        that touches a flag in mask.
+        """
+        self._subscribers.append((callback, mask))
+
+    def unsubscribe(self, callback):
+        self._subscribers = [(cb, m) for cb, m in self._subscribers if cb != callback]
+
+    def changes_since(self, version, mask=ALL_LAYERS):
+        """
+        Tiles whose flags in mask changed after the given version, oldest first.
+        Returns None when the dirty log no longer reaches back that far, in which
+        case the caller has to rebuild from scratch.
+        """
+        if version >= self.version:
+            return []
+        if not self.dirty or self.dirty[0][0] > version + 1:
+            return None
+        return [(row, col) for v, row, col, old, new in self.dirty
+                if v > version and (old ^ new) & mask]
+
+    def verify(self):
+        """
+        Debug mode only: raise RuntimeError if any tile was written without going
+        through this API (e.g. directly into `cells`).
+        """
+        if self._shadow is None or self.cells == self._shadow:
+            return
+        bad = [divmod(i, self.cols) for i in range(len(self.cells)) if self.cells[i] != self._shadow[i]]
+        raise RuntimeError(f"TileGrid written outside its API at tiles {bad[:10]}")